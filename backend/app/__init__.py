@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 import uuid
 
 from .extensions import db, jwt, cors
+from .socket import socketio, message_queue_options
 from .models import User
 
 load_dotenv()
@@ -22,6 +23,8 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
+    socketio.init_app(app, cors_allowed_origins=["http://localhost:3000"],
+                      **message_queue_options())
     
     # Configure CORS
     cors.init_app(app, 
@@ -63,9 +66,23 @@ def create_app():
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(events_bp, url_prefix='/api')
 
+    # CLI commands (flask events ...)
+    from .commands import register_commands
+    register_commands(app)
+
     # Create database tables and test user
     with app.app_context():
         db.create_all()
+
+        # Full-text search tables and sync triggers (SQLite with FTS5 only)
+        from .services.fulltext import FullTextSearch
+        FullTextSearch.install()
+
+        # Typeahead and fuzzy-match indexes; kept current by ORM events from here on
+        from .services.suggest_index import build_suggest_index
+        from .services.trigram_index import build_trigram_index
+        build_suggest_index()
+        build_trigram_index()
         
         # Create test user if it doesn't exist
         test_email = "test@example.com"
@@ -82,4 +99,58 @@ def create_app():
             db.session.commit()
             print(f"Test user created with email: {test_email}")
 
+    # Background workers, enabled by setting their interval in seconds
+    from .workers import PeriodicWorker
+    from .services.event_service import EventService
+
+    lifecycle_interval = os.getenv('EVENT_LIFECYCLE_INTERVAL')
+    if lifecycle_interval:
+        PeriodicWorker(app, float(lifecycle_interval), EventService.advance_statuses,
+                       name='event-lifecycle').start()
+
+    # On by default: it bounds how long counts from other processes can drift
+    from .services.unread_counter import unread_counter
+    reconcile_interval = float(os.getenv('UNREAD_COUNT_RECONCILE_INTERVAL', 60))
+    if reconcile_interval > 0:
+        PeriodicWorker(app, reconcile_interval, unread_counter.reconcile,
+                       name='unread-count-reconcile').start()
+
+    from .services.notification_service import NotificationService, DIGEST_INTERVAL
+    if DIGEST_INTERVAL > 0:
+        PeriodicWorker(app, DIGEST_INTERVAL, NotificationService.send_digests,
+                       name='notification-digest').start()
+
+    from .services.notification_retention import NotificationRetention
+    retention_interval = os.getenv('NOTIFICATION_RETENTION_INTERVAL')
+    if retention_interval:
+        PeriodicWorker(app, float(retention_interval), NotificationRetention.purge,
+                       name='notification-retention').start()
+
+    # Socket.IO emits queued by request handlers are delivered from here. Every
+    # worker may run one: batches are claimed, so each emit is sent once.
+    from .workers import SocketIOWorker
+    from .services.outbox_dispatcher import OutboxDispatcher, DISPATCH_INTERVAL
+    if DISPATCH_INTERVAL > 0:
+        SocketIOWorker(app, DISPATCH_INTERVAL, OutboxDispatcher.drain,
+                       name='outbox-dispatch').start()
+
+    # Socket-side batching, enabled by setting their interval in seconds. Left
+    # unset (as in CLI processes) typing changes are broadcast and messages
+    # written as they arrive, and presence changes aren't broadcast.
+    from .services import typing_throttle as typing
+    if typing.FLUSH_INTERVAL > 0:
+        SocketIOWorker(app, typing.FLUSH_INTERVAL, typing.typing_throttle.broadcast,
+                       name='typing-broadcast').start()
+
+    from .services import presence
+    if presence.BROADCAST_INTERVAL > 0:
+        SocketIOWorker(app, presence.BROADCAST_INTERVAL, presence.presence.broadcast,
+                       name='presence-broadcast').start()
+
+    from .services import message_buffer
+    if message_buffer.FLUSH_INTERVAL > 0:
+        SocketIOWorker(app, message_buffer.FLUSH_INTERVAL, message_buffer.message_buffer.flush,
+                       name='message-flush').start()
+        message_buffer.message_buffer.flush_on_shutdown(app)
+
     return app
\ No newline at end of file
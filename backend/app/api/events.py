@@ -3,18 +3,43 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import api
 from ..models.event import Event, EventAgendaItem, EventRequirement
 from ..models.user import User
+from ..pagination import paginate, InvalidCursor
+from ..http_cache import conditional_response, make_etag
+from ..services.event_service import EventService, EventFullError, AlreadyAttendingError
 from .. import db
-from datetime import datetime
+from datetime import datetime, date
 
 @api.route('/events', methods=['GET'])
 def get_events():
-    events = Event.query.all()
-    return jsonify([event.to_dict() for event in events])
+    query = EventService.filtered_query(
+        category=request.args.get('category'),
+        status=request.args.get('status'),
+        community_id=request.args.get('community', type=int)
+    )
+
+    try:
+        events, next_cursor = paginate(query, [Event.date, Event.id], [date, int])
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'events': [event.to_dict() for event in events],
+        'nextCursor': next_cursor
+    })
 
 @api.route('/events/<int:event_id>', methods=['GET'])
 def get_event(event_id):
-    event = Event.query.get_or_404(event_id)
-    return jsonify(event.to_dict())
+    # The response embeds the organizer's name, so their row counts too
+    validators = db.session.query(
+        Event.updated_at, Event.attendee_count, User.updated_at.label('organizer_updated_at')
+    ).join(User, User.id == Event.organizer_id).filter(Event.id == event_id).first_or_404()
+
+    return conditional_response(
+        make_etag('event', event_id, validators.updated_at.isoformat(), validators.attendee_count,
+                  validators.organizer_updated_at.isoformat()),
+        max(validators.updated_at, validators.organizer_updated_at),
+        lambda: jsonify(Event.query_for('detail').filter_by(id=event_id).one().to_dict())
+    )
 
 @api.route('/events', methods=['POST'])
 @jwt_required()
@@ -52,6 +77,7 @@ def create_event():
             event.requirements.append(requirement)
 
         db.session.add(event)
+        User.touch(current_user_id)
         db.session.commit()
 
         return jsonify(event.to_dict()), 201
@@ -78,9 +104,15 @@ def update_event(event_id):
             event.date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         if 'time' in data:
             event.time = datetime.strptime(data['time'], '%H:%M').time()
+        if 'date' in data or 'time' in data:
+            # advance_statuses only moves forward, so a rescheduled event
+            # gets its status from the new date and time here
+            event.status = EventService.status_at(event.date, event.time)
         event.location = data.get('location', event.location)
         event.category = data.get('category', event.category)
         event.capacity = data.get('capacity', event.capacity)
+        # Agenda/requirement edits only touch child rows
+        event.updated_at = datetime.utcnow()
 
         # Update agenda items
         if 'agenda' in data:
@@ -120,6 +152,7 @@ def delete_event(event_id):
 
     try:
         db.session.delete(event)
+        User.touch(current_user_id)
         db.session.commit()
         return '', 204
     except Exception as e:
@@ -131,33 +164,37 @@ def delete_event(event_id):
 def join_event(event_id):
     current_user_id = get_jwt_identity()
     event = Event.query.get_or_404(event_id)
-    user = User.query.get_or_404(current_user_id)
 
-    if user in event.attendees:
+    if EventService.is_attending(event.id, current_user_id):
         return jsonify({'error': 'Already joined'}), 400
 
     try:
-        event.attendees.append(user)
-        db.session.commit()
-        return jsonify(event.to_dict())
+        EventService.join_event(event.id, current_user_id)
+    except EventFullError as e:
+        return jsonify({'error': str(e)}), 409
+    except AlreadyAttendingError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+    event = Event.query_for('detail').filter_by(id=event_id).one()
+    return jsonify(event.to_dict())
+
 @api.route('/events/<int:event_id>/leave', methods=['POST'])
 @jwt_required()
 def leave_event(event_id):
     current_user_id = get_jwt_identity()
     event = Event.query.get_or_404(event_id)
-    user = User.query.get_or_404(current_user_id)
 
-    if user not in event.attendees:
+    if not EventService.is_attending(event.id, current_user_id):
         return jsonify({'error': 'Not joined'}), 400
 
     try:
-        event.attendees.remove(user)
-        db.session.commit()
-        return jsonify(event.to_dict())
+        EventService.leave_event(event.id, current_user_id)
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 400 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 400
+
+    event = Event.query_for('detail').filter_by(id=event_id).one()
+    return jsonify(event.to_dict()) 
\ No newline at end of file
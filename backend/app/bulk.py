@@ -0,0 +1,27 @@
+from collections import defaultdict
+
+from .extensions import db
+
+
+def insert_and_fetch(model, rows, key):
+    """Insert ``rows`` with one executemany INSERT and return them as loaded
+    ``model`` instances, in the order given.
+
+    executemany doesn't report generated ids, so the batch is read back in
+    the same transaction by the ``key`` columns. They must be non-null and
+    together tell the new rows apart from existing ones; rows sharing a key
+    are matched in id order.
+    """
+    if not rows:
+        return []
+
+    db.session.execute(model.__table__.insert(), rows)
+
+    query = model.query.filter(*(
+        getattr(model, name).in_({row[name] for row in rows}) for name in key
+    )).order_by(model.id)
+
+    written = defaultdict(list)
+    for obj in query:
+        written[tuple(getattr(obj, name) for name in key)].append(obj)
+    return [written[tuple(row[name] for name in key)].pop(0) for row in rows]
@@ -0,0 +1,106 @@
+import time
+
+import click
+from flask.cli import AppGroup
+
+events_cli = AppGroup('events', help='Event maintenance tasks.')
+search_cli = AppGroup('search', help='Search index maintenance.')
+notifications_cli = AppGroup('notifications', help='Notification maintenance tasks.')
+outbox_cli = AppGroup('outbox', help='Socket.IO outbox tasks.')
+
+
+@events_cli.command('advance-status')
+@click.option('--batch-size', default=500, show_default=True,
+              help='Rows updated per transaction.')
+@click.option('--interval', type=float, default=None,
+              help='Keep running, advancing statuses every INTERVAL seconds.')
+def advance_status(batch_size, interval):
+    """Move events to 'ongoing' or 'past' as their date and time pass."""
+    from .services.event_service import EventService
+
+    while True:
+        changed = EventService.advance_statuses(batch_size=batch_size)
+        click.echo(f"{changed['ongoing']} ongoing, {changed['past']} past")
+        if interval is None:
+            break
+        time.sleep(interval)
+
+
+@events_cli.command('sync-attendee-counts')
+def sync_attendee_counts():
+    """Recompute the denormalized attendee counts from event_attendees."""
+    from .services.event_service import EventService
+
+    EventService.sync_attendee_counts()
+    click.echo('Attendee counts synced')
+
+
+@search_cli.command('rebuild-index')
+@click.option('--kind', type=click.Choice(['events', 'groups', 'users']), default=None,
+              help='Only rebuild this index.')
+def rebuild_index(kind):
+    """Create the FTS5 tables if needed and rebuild them from the source tables."""
+    from .services.fulltext import FullTextSearch
+
+    if not FullTextSearch.install():
+        raise click.ClickException('Full-text search needs SQLite with FTS5')
+
+    for name in FullTextSearch.rebuild(kind):
+        click.echo(f'Rebuilt {name} index')
+
+
+@notifications_cli.command('purge')
+@click.option('--days', type=float, default=None,
+              help='Remove notifications read more than DAYS ago '
+                   '(default: NOTIFICATION_RETENTION_DAYS).')
+@click.option('--batch-size', default=1000, show_default=True,
+              help='Rows removed per transaction.')
+@click.option('--archive/--no-archive', default=None,
+              help='Copy rows to notification_archive before deleting '
+                   '(default: NOTIFICATION_ARCHIVE).')
+def purge_notifications(days, batch_size, archive):
+    """Archive and delete old read notifications."""
+    from .services.notification_retention import (
+        NotificationRetention, RETENTION_DAYS, ARCHIVE_ENABLED
+    )
+
+    removed = NotificationRetention.purge(
+        days=RETENTION_DAYS if days is None else days,
+        batch_size=batch_size,
+        archive=ARCHIVE_ENABLED if archive is None else archive
+    )
+    click.echo(f'Removed {removed} notifications')
+
+
+@outbox_cli.command('status')
+def outbox_status():
+    """Show how many emits are waiting in the outbox."""
+    from .services.outbox_dispatcher import OutboxDispatcher
+
+    depth = OutboxDispatcher.depth()
+    click.echo(f"{depth['pending']} pending, {depth['retrying']} retrying, "
+               f"oldest {depth['oldestAgeSeconds']:.1f}s")
+
+
+@outbox_cli.command('drain')
+@click.option('--interval', type=float, default=None,
+              help='Keep running, draining every INTERVAL seconds.')
+def outbox_drain(interval):
+    """Deliver every due emit now.
+
+    Emits reach clients on other processes when SOCKETIO_MESSAGE_QUEUE is set.
+    """
+    from .services.outbox_dispatcher import OutboxDispatcher
+
+    while True:
+        click.echo(f'Sent {OutboxDispatcher.drain()} emits')
+        if interval is None:
+            break
+        time.sleep(interval)
+
+
+def register_commands(app):
+    app.cli.add_command(events_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(outbox_cli)
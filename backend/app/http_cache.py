@@ -0,0 +1,48 @@
+import hashlib
+from datetime import timezone
+
+from flask import request, make_response
+
+
+def make_etag(*parts):
+    """Hash the values a representation depends on into a strong ETag."""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def is_not_modified(etag, last_modified=None):
+    """Check the request's conditional headers against our validators.
+
+    ``If-None-Match`` wins over ``If-Modified-Since`` when both are sent, as
+    RFC 7232 requires.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    since = request.if_modified_since
+    if since is not None and last_modified is not None:
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def conditional_response(etag, last_modified, build):
+    """Answer with 304 if the client is current, otherwise with ``build()``.
+
+    ``build`` is only called when the body is actually needed, so callers can
+    derive the validators from a cheap lookup and defer the full load and
+    serialization to it.
+    """
+    if is_not_modified(etag, last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Let clients cache, but always revalidate
+    response.cache_control.no_cache = True
+    return response
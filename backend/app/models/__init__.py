@@ -5,7 +5,8 @@ from .community import Community
 from .group import Group
 from .post import Post, Comment
 from .message import Message, Conversation
-from .notification import Notification
+from .notification import Notification, NotificationArchive
+from .outbox import SocketOutbox
 
 def init_db():
     """Initialize the database."""
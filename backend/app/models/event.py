@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy.orm import joinedload, selectinload
 from .. import db
 
 # Association table for event attendees
@@ -10,6 +11,14 @@ event_attendees = db.Table('event_attendees',
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Keyset pagination walks events in (date, id) order
+        db.Index('ix_events_date_id', 'date', 'id'),
+        # Calendar range scans narrowed by category or status; plain date
+        # ranges use ix_events_date_id
+        db.Index('ix_events_category_date', 'category', 'date'),
+        db.Index('ix_events_status_date', 'status', 'date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -27,6 +36,9 @@ class Event(db.Model):
 
     # Additional fields
     status = db.Column(db.String(20), default='upcoming')
+    # Denormalized; maintained by EventService.join_event/leave_event in the
+    # same transaction as the event_attendees row.
+    attendee_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -36,6 +48,11 @@ class Event(db.Model):
     agenda = db.relationship('EventAgendaItem', backref='event', cascade='all, delete-orphan')
     requirements = db.relationship('EventRequirement', backref='event', cascade='all, delete-orphan')
 
+    @classmethod
+    def query_for(cls, profile):
+        """Return ``Event.query`` with the loader options of a load profile."""
+        return cls.query.options(*EVENT_LOAD_PROFILES[profile])
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -48,7 +65,7 @@ class Event(db.Model):
             'capacity': self.capacity,
             'image_url': self.image_url,
             'status': self.status,
-            'attendees': len(self.attendees),
+            'attendees': self.attendee_count,
             'organizer': {
                 'id': self.organizer.id,
                 'name': f"{self.organizer.first_name} {self.organizer.last_name}",
@@ -91,4 +108,23 @@ class EventRequirement(db.Model):
             'id': self.id,
             'description': self.description,
             'order': self.order
-        } 
\ No newline at end of file
+        }
+
+# Loader options for the ways events are read. Everything to_dict touches is
+# fetched up front, so serializing a page of events costs a fixed number of
+# queries instead of several per event.
+EVENT_LOAD_PROFILES = {
+    # A page of events: one extra query per collection for the whole page,
+    # so rows aren't multiplied by agenda items times requirements
+    'list': (
+        joinedload(Event.organizer),
+        selectinload(Event.agenda),
+        selectinload(Event.requirements),
+    ),
+    # A single event: everything in one round-trip
+    'detail': (
+        joinedload(Event.organizer),
+        joinedload(Event.agenda),
+        joinedload(Event.requirements),
+    ),
+}
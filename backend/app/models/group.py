@@ -14,6 +14,8 @@ class Group(db.Model):
     image = db.Column(db.String(200))
     is_private = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Also bumped on membership changes, which don't touch this row otherwise
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
     members = db.relationship('User', secondary=group_members, lazy='subquery',
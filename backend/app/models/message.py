@@ -1,19 +1,30 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 conversation_participants = db.Table('conversation_participants',
     db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
-    db.Column('conversation_id', db.Integer, db.ForeignKey('conversation.id'), primary_key=True)
+    db.Column('conversation_id', db.Integer, db.ForeignKey('conversation.id'), primary_key=True),
+    # Read receipt: everything up to this message id has been read
+    db.Column('last_read_message_id', db.Integer)
 )
 
 class Conversation(db.Model):
     __tablename__ = 'conversation'
+    __table_args__ = (
+        # Inbox ordering
+        db.Index('ix_conversation_updated', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained on every message insert so the inbox needs no per-conversation
+    # lookup. No FK: conversation and message would reference each other.
+    last_message_id = db.Column(db.Integer)
     
-    messages = db.relationship('Message', backref='conversation', lazy=True)
+    # Potentially huge; read pages through MessageService.get_history instead
+    messages = db.relationship('Message', backref='conversation', lazy='dynamic')
     participants = db.relationship('User', 
         secondary=conversation_participants,
         lazy='subquery',
@@ -23,13 +34,18 @@ class Conversation(db.Model):
         return {
             'id': self.id,
             'participants': [user.to_dict() for user in self.participants],
-            'messages': [message.to_dict() for message in self.messages],
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
 
 class Message(db.Model):
     __tablename__ = 'message'
+    __table_args__ = (
+        # History pages walk a conversation newest-first
+        db.Index('ix_message_conversation_created', 'conversation_id', 'created_at', 'id'),
+        # Unread counts: messages after a participant's last_read_message_id
+        db.Index('ix_message_conversation_id', 'conversation_id', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
@@ -47,4 +63,13 @@ class Message(db.Model):
             'created_at': self.created_at.isoformat(),
             'read_at': self.read_at.isoformat() if self.read_at else None
         }
- 
\ No newline at end of file
+
+@event.listens_for(Message, 'after_insert')
+def _update_last_message(mapper, connection, target):
+    conversations = Conversation.__table__
+    connection.execute(
+        conversations.update()
+        .where(conversations.c.id == target.conversation_id)
+        .values(last_message_id=target.id, updated_at=target.created_at)
+    )
+
@@ -3,6 +3,18 @@ from datetime import datetime
 
 class Notification(db.Model):
     __tablename__ = 'notification'
+    __table_args__ = (
+        # Unread counts per user (UnreadCounter seeding and reconciliation)
+        db.Index('ix_notification_user_read', 'user_id', 'read_at'),
+        # Finding an open notification to coalesce into
+        db.Index('ix_notification_user_group', 'user_id', 'group_key'),
+        # Pending digest entries
+        db.Index('ix_notification_delivered', 'delivered_at'),
+        # Per-user history, newest first
+        db.Index('ix_notification_user_created', 'user_id', 'created_at'),
+        # Retention sweeps over read notifications
+        db.Index('ix_notification_read_at', 'read_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -10,7 +22,14 @@ class Notification(db.Model):
     content = db.Column(db.Text, nullable=False)
     reference_id = db.Column(db.Integer)
     reference_type = db.Column(db.String(50))
+    # Notifications sharing a group_key (e.g. one conversation) are merged
+    # into a single row while unread; count is how many were merged.
+    group_key = db.Column(db.String(100))
+    count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     read_at = db.Column(db.DateTime)
+    # Null while waiting for the next digest
+    delivered_at = db.Column(db.DateTime)
+    # Time of the latest activity; coalescing moves it forward
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def to_dict(self):
@@ -20,6 +39,28 @@ class Notification(db.Model):
             'content': self.content,
             'reference_id': self.reference_id,
             'reference_type': self.reference_type,
+            'count': self.count,
             'read_at': self.read_at.isoformat() if self.read_at else None,
             'created_at': self.created_at.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class NotificationArchive(db.Model):
+    """Read notifications moved out of the hot table by the retention job."""
+    __tablename__ = 'notification_archive'
+    __table_args__ = (
+        db.Index('ix_notification_archive_user_created', 'user_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    reference_id = db.Column(db.Integer)
+    reference_type = db.Column(db.String(50))
+    group_key = db.Column(db.String(100))
+    count = db.Column(db.Integer, nullable=False, default=1)
+    read_at = db.Column(db.DateTime)
+    delivered_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
@@ -0,0 +1,46 @@
+from app import db
+from datetime import datetime
+import json
+
+class SocketOutbox(db.Model):
+    """A Socket.IO emit waiting to be delivered by the outbox dispatcher.
+
+    Rows are written in the same transaction as the change they announce, so
+    a committed change always gets its emit and a rolled-back one never does.
+    """
+    __tablename__ = 'socket_outbox'
+    __table_args__ = (
+        db.Index('ix_socket_outbox_available', 'available_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event = db.Column(db.String(50), nullable=False)
+    room = db.Column(db.String(100))
+    payload = db.Column(db.Text, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Dispatcher run currently holding the row; its lease ends at available_at
+    claimed_by = db.Column(db.String(32))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def row(event, payload, room=None, now=None):
+        """Column values for one emit, for executemany inserts."""
+        now = now or datetime.utcnow()
+        return {
+            'event': event,
+            'room': room,
+            'payload': json.dumps(payload),
+            'attempts': 0,
+            'available_at': now,
+            'created_at': now
+        }
+
+    @staticmethod
+    def enqueue(events):
+        """Add ``(event, payload, room)`` emits to the current transaction."""
+        now = datetime.utcnow()
+        rows = [SocketOutbox.row(event, payload, room, now) for event, payload, room in events]
+        if rows:
+            db.session.execute(SocketOutbox.__table__.insert(), rows)
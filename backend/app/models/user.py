@@ -12,6 +12,20 @@ class User(db.Model):
     first_name = db.Column(db.String(50))
     last_name = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Also bumped by touch() when something shown on the profile changes
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def touch(cls, user_id):
+        """Bump updated_at without loading the row, invalidating profile ETags."""
+        cls.query.filter_by(id=user_id).update(
+            {'updated_at': datetime.utcnow()}, synchronize_session=False
+        )
+
+    @property
+    def display_name(self):
+        full_name = ' '.join(part for part in (self.first_name, self.last_name) if part)
+        return full_name or self.username
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+
+from flask import request
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(*values):
+    """Pack the sort key of the last row of a page into an opaque token."""
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, (date, datetime, time)) else value
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, *types):
+    """Unpack a token produced by ``encode_cursor``.
+
+    ``types`` gives the expected type of each value (``date``, ``datetime``,
+    ``time``, ``int`` or ``str``) so the result can be compared against the
+    sort columns directly.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor('Invalid cursor')
+
+    try:
+        return tuple(_coerce(value, type_) for value, type_ in zip(values, types))
+    except (TypeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def _coerce(value, type_):
+    if type_ in (date, datetime, time):
+        return type_.fromisoformat(value)
+    return type_(value)
+
+
+def keyset_filter(columns, values, descending=False):
+    """Build ``(c1, c2, ...) > (v1, v2, ...)`` without relying on row values.
+
+    Expanded to ``c1 > v1 OR (c1 = v1 AND c2 > v2) ...`` so it works on every
+    backend and still lets the planner use a composite index on the columns.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal = [c == v for c, v in zip(columns[:i], values[:i])]
+        step = column < value if descending else column > value
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def get_page_size(default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Read ``limit`` from the query string, clamped to ``[1, maximum]``."""
+    limit = request.args.get('limit', default, type=int)
+    return max(1, min(limit, maximum))
+
+
+def paginate(query, columns, cursor_types, descending=False, limit=None):
+    """Return one keyset page of ``query`` and the cursor for the next one.
+
+    ``query`` must not be ordered yet; it is ordered by ``columns`` here. The
+    ``cursor`` query string argument, when present, resumes after the row it
+    was issued for. Fetching ``limit + 1`` rows tells us whether a next page
+    exists without a separate ``COUNT``.
+    """
+    if limit is None:
+        limit = get_page_size()
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        query = query.filter(
+            keyset_filter(columns, decode_cursor(cursor, *cursor_types), descending)
+        )
+
+    order = [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(*(getattr(last, c.key) for c in columns))
+
+    return rows, next_cursor
@@ -1,39 +1,64 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..models import db, Event, User
-from datetime import datetime
+from ..pagination import paginate, InvalidCursor
+from ..services.event_service import EventService, EventFullError, AlreadyAttendingError
+from datetime import datetime, date
 import uuid
 
 events_bp = Blueprint('events', __name__)
 
+# Enough for a calendar year view; keeps a single range request bounded
+MAX_RANGE_DAYS = 366
+
 @events_bp.route('/events', methods=['GET'])
 def get_events():
     try:
-        events = Event.query.all()
-        return jsonify([{
-            'id': event.id,
-            'title': event.title,
-            'description': event.description,
-            'date': event.date.isoformat(),
-            'time': event.time,
-            'endTime': event.end_time,
-            'location': event.location,
-            'category': event.category,
-            'capacity': event.capacity,
-            'organizer': {
-                'id': event.organizer.id,
-                'name': event.organizer.name
-            },
-            'attendees': [{
-                'id': attendee.id,
-                'name': attendee.name
-            } for attendee in event.attendees],
-            'agenda': event.agenda,
-            'requirements': event.requirements
-        } for event in events]), 200
+        query = EventService.filtered_query(
+            category=request.args.get('category'),
+            status=request.args.get('status'),
+            community_id=request.args.get('community', type=int)
+        )
+        events, next_cursor = paginate(query, [Event.date, Event.id], [date, int])
+        return jsonify({
+            'events': [
+                dict(event.to_dict(), attendeeCount=event.attendee_count)
+                for event in events
+            ],
+            'nextCursor': next_cursor
+        }), 200
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@events_bp.route('/events/range', methods=['GET'])
+def get_events_in_range():
+    try:
+        start = date.fromisoformat(request.args['from'])
+        end = date.fromisoformat(request.args['to'])
+    except (KeyError, ValueError):
+        return jsonify({'error': 'from and to must be dates in YYYY-MM-DD format'}), 400
+
+    if end < start:
+        return jsonify({'error': 'from must not be after to'}), 400
+    if (end - start).days > MAX_RANGE_DAYS:
+        return jsonify({'error': f'Range cannot exceed {MAX_RANGE_DAYS} days'}), 400
+
+    events = EventService.events_in_range(
+        start,
+        end,
+        category=request.args.get('category'),
+        status=request.args.get('status')
+    )
+    return jsonify([{
+        'id': event.id,
+        'title': event.title,
+        'date': event.date.isoformat(),
+        'time': event.time.isoformat(),
+        'attendeeCount': event.attendee_count
+    } for event in events]), 200
+
 @events_bp.route('/events', methods=['POST'])
 @jwt_required()
 def create_event():
@@ -57,6 +82,7 @@ def create_event():
         )
         
         db.session.add(event)
+        User.touch(user_id)
         db.session.commit()
         
         return jsonify({
@@ -73,25 +99,26 @@ def create_event():
 def join_event(event_id):
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
         event = Event.query.get(event_id)
         
         if not event:
             return jsonify({'error': 'Event not found'}), 404
             
-        is_already_joined = user in event.attendees
+        is_already_joined = EventService.is_attending(event.id, user_id)
         
         if is_already_joined:
-            event.attendees.remove(user)
+            attendee_count = EventService.leave_event(event.id, user_id)
         else:
-            event.attendees.append(user)
-            
-        db.session.commit()
+            attendee_count = EventService.join_event(event.id, user_id)
         
         return jsonify({
             'isJoined': not is_already_joined,
-            'attendeeCount': len(event.attendees)
+            'attendeeCount': attendee_count
         }), 200
+    except EventFullError as e:
+        return jsonify({'error': str(e)}), 409
+    except AlreadyAttendingError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500 
\ No newline at end of file
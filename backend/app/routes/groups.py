@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Group
+from app.models import Group, User
+from app.http_cache import conditional_response, make_etag
 from app import db
+from datetime import datetime
 
 groups_bp = Blueprint('groups', __name__)
 
@@ -14,8 +16,19 @@ def get_groups():
 @groups_bp.route('/groups/<int:group_id>', methods=['GET'])
 @jwt_required()
 def get_group(group_id):
-    group = Group.query.get_or_404(group_id)
-    return jsonify(group.to_dict())
+    # The response embeds the creator's profile, so it depends on both rows
+    validators = db.session.query(Group.updated_at, User.updated_at.label('creator_updated_at')).join(
+        User, User.id == Group.creator_id
+    ).filter(Group.id == group_id).first()
+    if validators is None:
+        return jsonify({'error': 'Group not found'}), 404
+
+    return conditional_response(
+        make_etag('group', group_id, validators.updated_at.isoformat(),
+                  validators.creator_updated_at.isoformat()),
+        max(validators.updated_at, validators.creator_updated_at),
+        lambda: jsonify(Group.query.get(group_id).to_dict())
+    )
 
 @groups_bp.route('/groups', methods=['POST'])
 @jwt_required()
@@ -34,6 +47,7 @@ def create_group():
     group.members.append(User.query.get(user_id))  # Add creator as member
     
     db.session.add(group)
+    User.touch(user_id)
     db.session.commit()
     
     return jsonify(group.to_dict()), 201
@@ -47,6 +61,8 @@ def join_group(group_id):
     
     if user not in group.members:
         group.members.append(user)
+        group.updated_at = datetime.utcnow()
+        User.touch(user_id)
         db.session.commit()
     
     return jsonify(group.to_dict())
@@ -60,6 +76,8 @@ def leave_group(group_id):
     
     if user in group.members:
         group.members.remove(user)
+        group.updated_at = datetime.utcnow()
+        User.touch(user_id)
         db.session.commit()
     
     return jsonify(group.to_dict()) 
\ No newline at end of file
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, Message, User
+from app.services.message_service import MessageService
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor, get_page_size
+from datetime import datetime
 
 messages_bp = Blueprint('messages', __name__)
 
@@ -21,13 +24,82 @@ def send_message():
     
     return jsonify(message.to_dict()), 201
 
-@messages_bp.route('/messages/<receiver_id>', methods=['GET'])
+@messages_bp.route('/conversations/<int:conversation_id>/messages', methods=['GET'])
 @jwt_required()
-def get_messages(receiver_id):
+def get_messages(conversation_id):
+    """Newest messages of a conversation, paged back with ``before=<message_id>``."""
     user_id = get_jwt_identity()
-    messages = Message.query.filter(
-        ((Message.sender_id == user_id) & (Message.receiver_id == receiver_id)) |
-        ((Message.sender_id == receiver_id) & (Message.receiver_id == user_id))
-    ).order_by(Message.created_at.asc()).all()
-    
-    return jsonify([message.to_dict() for message in messages]) 
\ No newline at end of file
+    if not MessageService.is_participant(conversation_id, user_id):
+        return jsonify({'error': 'Conversation not found'}), 404
+
+    try:
+        messages, has_more = MessageService.get_history(
+            conversation_id,
+            before_id=request.args.get('before', type=int),
+            limit=get_page_size(default=50)
+        )
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'messages': [message.to_dict() for message in messages],
+        'nextCursor': messages[0].id if has_more else None
+    })
+
+@messages_bp.route('/conversations', methods=['GET'])
+@jwt_required()
+def get_inbox():
+    """Conversation list with last-message preview and unread counts."""
+    user_id = get_jwt_identity()
+    before = request.args.get('cursor')
+
+    try:
+        rows, has_more = MessageService.get_inbox(
+            user_id,
+            before=decode_cursor(before, datetime, int) if before else None,
+            limit=get_page_size(default=20)
+        )
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
+    conversations = []
+    for conversation, last_message, unread_count in rows:
+        conversation_data = conversation.to_dict()
+        conversation_data['lastMessage'] = last_message.to_dict() if last_message else None
+        conversation_data['unreadCount'] = unread_count
+        conversations.append(conversation_data)
+
+    last = rows[-1][0] if rows else None
+    return jsonify({
+        'conversations': conversations,
+        'nextCursor': encode_cursor(last.updated_at, last.id) if has_more else None
+    })
+
+@messages_bp.route('/conversations/unread', methods=['GET'])
+@jwt_required()
+def get_unread_counts():
+    user_id = get_jwt_identity()
+    counts = MessageService.get_unread_counts(user_id)
+    return jsonify({
+        'conversations': {str(conversation_id): count for conversation_id, count in counts.items()},
+        'total': sum(counts.values())
+    })
+
+@messages_bp.route('/conversations/<int:conversation_id>/read', methods=['POST'])
+@jwt_required()
+def mark_conversation_read(conversation_id):
+    """Mark the conversation read up to ``messageId``."""
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+
+    if not MessageService.is_participant(conversation_id, user_id):
+        return jsonify({'error': 'Conversation not found'}), 404
+    if not isinstance(data.get('messageId'), int):
+        return jsonify({'error': 'messageId is required'}), 400
+
+    try:
+        marked = MessageService.mark_read(conversation_id, user_id, data['messageId'])
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+
+    return jsonify({'marked': marked})
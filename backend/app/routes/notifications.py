@@ -1,7 +1,8 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Notification
-from app import db
+from app.services.notification_service import NotificationService
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor, get_page_size, keyset_filter
 from datetime import datetime
 
 notifications_bp = Blueprint('notifications', __name__)
@@ -9,36 +10,66 @@ notifications_bp = Blueprint('notifications', __name__)
 @notifications_bp.route('/notifications', methods=['GET'])
 @jwt_required()
 def get_notifications():
+    """Newest-first notifications, keyset-paginated on (created_at, id).
+
+    ``before=<cursor>`` pages back through older history. ``since=<cursor>``
+    returns only rows newer than the client's high-water mark (including
+    coalesced rows that were bumped), so an idle poll returns an empty list.
+    Every response carries ``sinceCursor`` for the next poll.
+    """
     user_id = get_jwt_identity()
-    notifications = Notification.query.filter_by(
-        user_id=user_id
-    ).order_by(
-        Notification.created_at.desc()
-    ).limit(50).all()
-    
-    return jsonify([notif.to_dict() for notif in notifications])
+    before = request.args.get('before')
+    since = request.args.get('since')
+    limit = get_page_size(default=50)
+    columns = [Notification.created_at, Notification.id]
+
+    if before and since:
+        return jsonify({'error': 'Use either before or since, not both'}), 400
+
+    query = Notification.query.filter_by(user_id=user_id)
+    try:
+        if since:
+            since_key = decode_cursor(since, datetime, int)
+            query = query.filter(keyset_filter(columns, since_key))
+        elif before:
+            query = query.filter(keyset_filter(columns, decode_cursor(before, datetime, int), descending=True))
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
+    if since:
+        # Oldest unseen first, so a client that is far behind catches up in order
+        notifications = query.order_by(
+            Notification.created_at.asc(), Notification.id.asc()
+        ).limit(limit + 1).all()
+        has_more = len(notifications) > limit
+        notifications = notifications[:limit][::-1]
+    else:
+        notifications = query.order_by(
+            Notification.created_at.desc(), Notification.id.desc()
+        ).limit(limit + 1).all()
+        has_more = len(notifications) > limit
+        notifications = notifications[:limit]
+
+    newest = notifications[0] if notifications else None
+    oldest = notifications[-1] if notifications else None
+
+    return jsonify({
+        'notifications': [notif.to_dict() for notif in notifications],
+        'nextCursor': encode_cursor(oldest.created_at, oldest.id) if has_more and not since else None,
+        'sinceCursor': encode_cursor(newest.created_at, newest.id) if newest and not before else since,
+        'hasMore': has_more
+    })
 
 @notifications_bp.route('/notifications/unread/count', methods=['GET'])
 @jwt_required()
 def get_unread_count():
     user_id = get_jwt_identity()
-    count = Notification.query.filter_by(
-        user_id=user_id,
-        read_at=None
-    ).count()
-    
-    return jsonify({'count': count})
+    # Served from the in-memory counter; no COUNT(*) per poll
+    return jsonify({'count': NotificationService.get_unread_count(user_id)})
 
 @notifications_bp.route('/notifications/mark-read', methods=['POST'])
 @jwt_required()
 def mark_all_read():
     user_id = get_jwt_identity()
-    Notification.query.filter_by(
-        user_id=user_id,
-        read_at=None
-    ).update({
-        'read_at': datetime.utcnow()
-    })
-    
-    db.session.commit()
+    NotificationService.mark_all_read(user_id)
     return jsonify({'status': 'success'}) 
\ No newline at end of file
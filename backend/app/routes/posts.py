@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Post, Comment
+from app.models import Post, Comment, User
 from app import db
 
 posts_bp = Blueprint('posts', __name__)
@@ -23,6 +23,7 @@ def create_post():
     )
     
     db.session.add(post)
+    User.touch(user_id)  # post count is part of the profile
     db.session.commit()
     
     return jsonify(post.to_dict()), 201
@@ -2,38 +2,29 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.models.post import Post
+from app.http_cache import conditional_response, make_etag
+from app.services.presence import presence
 from app import db
 
 profiles_bp = Blueprint('profiles', __name__)
 
+MAX_PRESENCE_IDS = 200
+
 @profiles_bp.route('/api/profiles/<username>', methods=['GET'])
 @jwt_required()
 def get_profile(username):
     try:
         print(f"Fetching profile for username: {username}")
-        user = User.query.filter_by(username=username).first()
+        validators = db.session.query(User.id, User.updated_at).filter_by(username=username).first()
         
-        if not user:
+        if not validators:
             return jsonify({'error': 'User not found'}), 404
             
-        profile_data = {
-            'id': str(user.id),
-            'firstName': user.first_name,
-            'lastName': user.last_name,
-            'username': user.username,
-            'bio': user.bio or '',
-            'location': user.location or '',
-            'interests': user.interests or [],
-            'joinedDate': user.created_at.isoformat() if user.created_at else '',
-            'profileStats': {
-                'posts': user.posts.count(),
-                'events': user.events.count(),
-                'groups': user.groups.count(),
-                'connections': 0  # Implement connections count if needed
-            }
-        }
-        
-        return jsonify(profile_data)
+        return conditional_response(
+            make_etag('profile', validators.id, validators.updated_at.isoformat()),
+            validators.updated_at,
+            lambda: jsonify(_serialize_profile(User.query.get(validators.id)))
+        )
         
     except Exception as e:
         print(f"Error fetching profile: {str(e)}")
@@ -41,6 +32,47 @@ def get_profile(username):
         traceback.print_exc()
         return jsonify({'error': 'Internal server error'}), 500
 
+@profiles_bp.route('/api/presence', methods=['GET'])
+@jwt_required()
+def get_presence():
+    """Which of ``ids`` (comma separated, at most MAX_PRESENCE_IDS) are online.
+
+    Answers from this process's PresenceRegistry, so it is only complete
+    when the socket server runs as one process alongside this route.
+    """
+    try:
+        user_ids = [int(id_) for id_ in request.args.get('ids', '').split(',') if id_]
+    except ValueError:
+        return jsonify({'error': 'ids must be comma-separated user ids'}), 400
+    if len(user_ids) > MAX_PRESENCE_IDS:
+        return jsonify({'error': f'At most {MAX_PRESENCE_IDS} ids per request'}), 400
+
+    return jsonify({
+        str(user_id): {
+            'online': online,
+            'lastSeen': last_seen.isoformat() if last_seen else None
+        }
+        for user_id, (online, last_seen) in presence.lookup(user_ids).items()
+    })
+
+def _serialize_profile(user):
+    return {
+        'id': str(user.id),
+        'firstName': user.first_name,
+        'lastName': user.last_name,
+        'username': user.username,
+        'bio': user.bio or '',
+        'location': user.location or '',
+        'interests': user.interests or [],
+        'joinedDate': user.created_at.isoformat() if user.created_at else '',
+        'profileStats': {
+            'posts': user.posts.count(),
+            'events': user.events.count(),
+            'groups': user.groups.count(),
+            'connections': 0  # Implement connections count if needed
+        }
+    }
+
 @profiles_bp.route('/api/profiles/<username>/posts', methods=['GET'])
 @jwt_required()
 def get_user_posts(username):
@@ -76,22 +108,7 @@ def update_profile(user_id):
             
         db.session.commit()
         
-        return jsonify({
-            'id': str(user.id),
-            'firstName': user.first_name,
-            'lastName': user.last_name,
-            'username': user.username,
-            'bio': user.bio or '',
-            'location': user.location or '',
-            'interests': user.interests or [],
-            'joinedDate': user.created_at.isoformat() if user.created_at else '',
-            'profileStats': {
-                'posts': user.posts.count(),
-                'events': user.events.count(),
-                'groups': user.groups.count(),
-                'connections': 0
-            }
-        })
+        return jsonify(_serialize_profile(user))
         
     except Exception as e:
         print(f"Error updating profile: {str(e)}")
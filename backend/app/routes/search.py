@@ -1,14 +1,32 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.services.search_service import SearchService
+from app.services.search_cache import search_cache
+from app.services.suggest_index import suggest_index
 
 search_bp = Blueprint('search', __name__)
 
+SEARCHES = {
+    'all': lambda query, limit: SearchService.search_all(query, limit or 10),
+    'events': lambda query, limit: {'events': SearchService.search_events(query, limit or 20)},
+    'groups': lambda query, limit: {'groups': SearchService.search_groups(query, limit or 20)},
+    'users': lambda query, limit: {'users': SearchService.search_users(query, limit or 20)},
+}
+
+def _run_search(search_type, query, limit):
+    results = SEARCHES[search_type](query, limit)
+    # Nothing matched as typed; try typo-tolerant matching before giving up
+    if not any(results.values()):
+        results = SearchService.fuzzy_search(query, search_type, limit or 10)
+        results['fuzzy'] = True
+    return results
+
 @search_bp.route('/search', methods=['GET'])
 @jwt_required()
 def search():
     query = request.args.get('q', '')
     search_type = request.args.get('type', 'all')
+    limit = request.args.get('limit', type=int)
     
     if not query:
         return jsonify({
@@ -17,15 +35,33 @@ def search():
             'users': []
         })
     
-    if search_type == 'all':
-        results = SearchService.search_all(query)
-    elif search_type == 'events':
-        results = {'events': SearchService.search_events(query)}
-    elif search_type == 'groups':
-        results = {'groups': SearchService.search_groups(query)}
-    elif search_type == 'users':
-        results = {'users': SearchService.search_users(query)}
-    else:
+    if search_type not in SEARCHES:
         return jsonify({'error': 'Invalid search type'}), 400
+    if limit is not None:
+        limit = max(1, min(limit, 50))
+    
+    key = search_cache.make_key(query, search_type, limit)
+    results = search_cache.get_or_compute(
+        key,
+        lambda: _run_search(search_type, key[0], limit)
+    )
     
-    return jsonify(results)
\ No newline at end of file
+    return jsonify(results)
+
+@search_bp.route('/search/cache/stats', methods=['GET'])
+@jwt_required()
+def search_cache_stats():
+    return jsonify(search_cache.stats())
+
+@search_bp.route('/search/suggest', methods=['GET'])
+@jwt_required()
+def suggest():
+    prefix = request.args.get('q', '')
+    kind = request.args.get('type')
+    limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+
+    if kind not in (None, 'user', 'group'):
+        return jsonify({'error': 'Invalid suggestion type'}), 400
+
+    # Served entirely from the in-process index; no database access
+    return jsonify(suggest_index.suggest(prefix, limit, kind))
@@ -0,0 +1,219 @@
+import os
+from datetime import datetime
+from dateutil import tz
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.exc import IntegrityError
+from app.models import Event, User
+from app.models.event import event_attendees
+from app import db
+
+
+# Event date/time columns hold the organizer's wall-clock time in this zone
+# (an IANA name such as 'Africa/Nairobi'); unset means the server's local time.
+EVENT_TIMEZONE = os.getenv('EVENT_TIMEZONE')
+
+
+def event_local_now():
+    """The current wall-clock time in EVENT_TIMEZONE, as a naive datetime."""
+    zone = tz.gettz(EVENT_TIMEZONE) if EVENT_TIMEZONE else tz.tzlocal()
+    if zone is None:
+        raise ValueError(f'Unknown EVENT_TIMEZONE {EVENT_TIMEZONE!r}')
+    return datetime.now(zone).replace(tzinfo=None)
+
+
+class EventFullError(Exception):
+    pass
+
+
+class AlreadyAttendingError(Exception):
+    pass
+
+
+class EventService:
+    @staticmethod
+    def filtered_query(category=None, status=None, community_id=None, profile='list'):
+        query = Event.query_for(profile)
+
+        if category:
+            query = query.filter(Event.category == category)
+        if status:
+            query = query.filter(Event.status == status)
+        if community_id is not None:
+            query = query.filter(Event.community_id == community_id)
+
+        return query
+
+    @staticmethod
+    def events_in_range(start, end, category=None, status=None):
+        """Compact rows for events dated ``start`` to ``end`` inclusive.
+
+        Only the columns a calendar cell needs are selected, so the query is an
+        index range scan on (date) or (category, date) with no ORM objects built.
+        """
+        query = db.session.query(
+            Event.id,
+            Event.title,
+            Event.date,
+            Event.time,
+            Event.attendee_count
+        ).filter(Event.date >= start, Event.date <= end)
+
+        if category:
+            query = query.filter(Event.category == category)
+        if status:
+            query = query.filter(Event.status == status)
+
+        return query.order_by(Event.date.asc(), Event.time.asc()).all()
+
+    @staticmethod
+    def is_attending(event_id, user_id):
+        """Primary-key lookup on event_attendees; never loads the attendee list."""
+        return db.session.query(
+            exists().where(and_(
+                event_attendees.c.event_id == event_id,
+                event_attendees.c.user_id == user_id
+            ))
+        ).scalar()
+
+    @staticmethod
+    def get_attendee_count(event_id):
+        return db.session.query(Event.attendee_count).filter(Event.id == event_id).scalar()
+
+    @staticmethod
+    def join_event(event_id, user_id):
+        """Add a user to an event and return the new attendee count.
+
+        The seat is taken with one guarded UPDATE (``attendee_count <
+        capacity``), so concurrent joins serialize on the event row and the
+        event can never be overbooked. The attendee row is written in the same
+        transaction.
+        """
+        events = Event.__table__
+        reserved = db.session.execute(
+            events.update()
+            .where(events.c.id == event_id)
+            .where(events.c.attendee_count < events.c.capacity)
+            .values(attendee_count=events.c.attendee_count + 1)
+        ).rowcount
+
+        if not reserved:
+            db.session.rollback()
+            raise EventFullError('Event is full')
+
+        try:
+            db.session.execute(
+                event_attendees.insert().values(event_id=event_id, user_id=user_id)
+            )
+            User.touch(user_id)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise AlreadyAttendingError('Already joined')
+
+        return EventService.get_attendee_count(event_id)
+
+    @staticmethod
+    def leave_event(event_id, user_id):
+        """Remove a user from an event and return the new attendee count."""
+        removed = db.session.execute(
+            event_attendees.delete().where(and_(
+                event_attendees.c.event_id == event_id,
+                event_attendees.c.user_id == user_id
+            ))
+        ).rowcount
+
+        if removed:
+            events = Event.__table__
+            db.session.execute(
+                events.update()
+                .where(events.c.id == event_id)
+                .values(attendee_count=events.c.attendee_count - 1)
+            )
+            User.touch(user_id)
+        db.session.commit()
+
+        return EventService.get_attendee_count(event_id)
+
+    @staticmethod
+    def sync_attendee_counts():
+        """Recompute attendee_count from event_attendees for every event.
+
+        Only needed to backfill databases created before the column existed.
+        """
+        events = Event.__table__
+        db.session.execute(
+            events.update().values(attendee_count=(
+                select(func.count(event_attendees.c.user_id))
+                .where(event_attendees.c.event_id == events.c.id)
+                .scalar_subquery()
+            ))
+        )
+        db.session.commit()
+
+    @staticmethod
+    def status_at(event_date, event_time, now=None):
+        """The lifecycle status an event on ``event_date`` at ``event_time``
+        has at ``now`` (default: the time in EVENT_TIMEZONE).
+        """
+        now = now or event_local_now()
+        if event_date < now.date():
+            return 'past'
+        if event_date == now.date() and event_time <= now.time():
+            return 'ongoing'
+        return 'upcoming'
+
+    @staticmethod
+    def advance_statuses(now=None, batch_size=500):
+        """Move events whose start has passed to 'ongoing', and events from
+        earlier days to 'past'.
+
+        Each transition is applied as bulk UPDATEs of at most ``batch_size``
+        rows, keyed on the (status, date) index, so long write locks are
+        avoided even after a large backlog. Returns the number of events
+        moved into each status. ``now`` is compared with the events' own
+        wall-clock date and time, so it defaults to the time in EVENT_TIMEZONE.
+        """
+        now = now or event_local_now()
+        today = now.date()
+
+        changed = {
+            'past': EventService._transition(
+                and_(Event.status.in_(('upcoming', 'ongoing')), Event.date < today),
+                'past',
+                batch_size
+            ),
+            'ongoing': EventService._transition(
+                and_(
+                    Event.status == 'upcoming',
+                    Event.date == today,
+                    Event.time <= now.time()
+                ),
+                'ongoing',
+                batch_size
+            ),
+        }
+        return changed
+
+    @staticmethod
+    def _transition(condition, status, batch_size):
+        events = Event.__table__
+        total = 0
+
+        while True:
+            ids = [row.id for row in db.session.query(Event.id).filter(condition).limit(batch_size)]
+            if not ids:
+                break
+
+            db.session.execute(
+                events.update()
+                .where(events.c.id.in_(ids))
+                .values(status=status)
+            )
+            db.session.commit()
+            total += len(ids)
+
+            if len(ids) < batch_size:
+                break
+
+        return total
+
@@ -0,0 +1,191 @@
+import re
+
+from sqlalchemy import text
+from app import db
+
+# One external-content FTS5 table per searchable model. The FTS tables only
+# hold the inverted index; the text itself stays in the source table.
+FTS_INDEXES = {
+    'events': {
+        'table': 'events_fts',
+        'source': 'events',
+        'columns': ('title', 'description', 'location'),
+        'weights': (10.0, 1.0, 2.0),
+    },
+    'groups': {
+        'table': 'groups_fts',
+        'source': 'group',
+        'columns': ('name', 'description'),
+        'weights': (10.0, 1.0),
+    },
+    'users': {
+        'table': 'users_fts',
+        'source': 'users',
+        'columns': ('username', 'first_name', 'last_name', 'email'),
+        'weights': (10.0, 5.0, 5.0, 1.0),
+    },
+}
+
+# Columns returned by search_all_rows, as (source table, label, detail, extra)
+_PROJECTIONS = {
+    'events': ('events', 's.title', 's.location', 'CAST(s.date AS TEXT)'),
+    'groups': ('group', 's.name', 's.description', 'NULL'),
+    'users': ('users', 's.username', 's.first_name', 's.last_name'),
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class FullTextSearch:
+    _available = {}
+
+    @staticmethod
+    def is_available():
+        """True when the database is SQLite with the FTS5 extension built in."""
+        engine = db.engine
+        if engine.url not in FullTextSearch._available:
+            available = False
+            if engine.dialect.name == 'sqlite':
+                with engine.connect() as conn:
+                    options = {row[0] for row in conn.execute(text('PRAGMA compile_options'))}
+                available = 'ENABLE_FTS5' in options
+            FullTextSearch._available[engine.url] = available
+        return FullTextSearch._available[engine.url]
+
+    @staticmethod
+    def install():
+        """Create the FTS tables and the triggers that keep them in sync.
+
+        Idempotent, so it is safe to run on every startup. An index whose
+        sync triggers were missing is rebuilt from its source straight away:
+        either the FTS table is new, or the source table was dropped and
+        recreated (as reset_db.py does) and the index still holds the old
+        rows. Either way existing rows become searchable and the delete
+        triggers never hit unindexed rows. Does nothing on databases without
+        FTS5; SearchService then falls back to LIKE.
+        """
+        if not FullTextSearch.is_available():
+            return False
+
+        with db.engine.begin() as conn:
+            for index in FTS_INDEXES.values():
+                table = index['table']
+                triggers = {f'{table}_ai', f'{table}_ad', f'{table}_au'}
+                existing = {row[0] for row in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :source"),
+                    {'source': index['source']}
+                )}
+                for statement in _ddl(index):
+                    conn.execute(text(statement))
+                if not triggers <= existing:
+                    conn.execute(text(f"INSERT INTO {table}({table}) VALUES('rebuild')"))
+        return True
+
+    @staticmethod
+    def rebuild(kind=None):
+        """Rebuild one index (or all of them) from its source table."""
+        kinds = [kind] if kind else list(FTS_INDEXES)
+        with db.engine.begin() as conn:
+            for name in kinds:
+                table = FTS_INDEXES[name]['table']
+                conn.execute(text(f"INSERT INTO {table}({table}) VALUES('rebuild')"))
+        return kinds
+
+    @staticmethod
+    def match_expression(query):
+        """Turn free text into an FTS5 query of quoted prefix terms.
+
+        Every word must match (implicit AND) and the last characters typed
+        may be an incomplete word, so each term is a prefix match. Quoting
+        keeps FTS5 operators in user input from being interpreted.
+        """
+        tokens = _TOKEN_RE.findall(query)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def search_ids(kind, query, limit):
+        """Return matching row ids for ``kind``, best BM25 rank first."""
+        expression = FullTextSearch.match_expression(query)
+        if not expression:
+            return []
+
+        index = FTS_INDEXES[kind]
+        table = index['table']
+        weights = ', '.join(str(weight) for weight in index['weights'])
+        rows = db.session.execute(
+            text(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH :expression '
+                f'ORDER BY bm25({table}, {weights}) LIMIT :limit'
+            ),
+            {'expression': expression, 'limit': limit}
+        )
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def search_all_rows(query, limit):
+        """Rank events, groups and users in one UNION ALL round-trip.
+
+        Each branch is an index lookup limited to ``limit`` rows and selects
+        only the columns of SearchService's compact projections, as
+        ``(kind, id, label, detail, extra)``.
+        """
+        expression = FullTextSearch.match_expression(query)
+        if not expression:
+            return []
+
+        branches = []
+        for kind, (source, label, detail, extra) in _PROJECTIONS.items():
+            index = FTS_INDEXES[kind]
+            table = index['table']
+            weights = ', '.join(str(weight) for weight in index['weights'])
+            branches.append(
+                f"SELECT * FROM (SELECT '{kind}' AS kind, s.id AS id, {label} AS label, "
+                f"{detail} AS detail, {extra} AS extra "
+                f'FROM {table} JOIN "{source}" s ON s.id = {table}.rowid '
+                f'WHERE {table} MATCH :expression '
+                f'ORDER BY bm25({table}, {weights}) LIMIT :limit)'
+            )
+
+        return db.session.execute(
+            text(' UNION ALL '.join(branches)),
+            {'expression': expression, 'limit': limit}
+        ).fetchall()
+
+    @staticmethod
+    def search(model, kind, query, limit):
+        """Load the ``model`` rows matching ``query``, in rank order."""
+        ids = FullTextSearch.search_ids(kind, query, limit)
+        if not ids:
+            return []
+
+        by_id = {obj.id: obj for obj in model.query.filter(model.id.in_(ids))}
+        return [by_id[id_] for id_ in ids if id_ in by_id]
+
+
+def _ddl(index):
+    table = index['table']
+    source = index['source']
+    columns = ', '.join(index['columns'])
+    new_values = ', '.join(f'new.{column}' for column in index['columns'])
+    old_values = ', '.join(f'old.{column}' for column in index['columns'])
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+        f"{columns}, content='{source}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+
+        f'CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON "{source}" BEGIN '
+        f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values}); "
+        f"END",
+
+        f'CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON "{source}" BEGIN '
+        f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"END",
+
+        # Only fire for the indexed columns so counters and status updates
+        # don't rewrite the index entry.
+        f'CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {columns} ON "{source}" BEGIN '
+        f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values}); "
+        f"END",
+    ]
@@ -0,0 +1,193 @@
+import atexit
+import logging
+import os
+import signal
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import bindparam, or_
+from app.models import Conversation, Message
+from app import db
+from app.bulk import insert_and_fetch
+from app.socket import socketio
+
+logger = logging.getLogger(__name__)
+
+# Buffered messages are written at least this often, in seconds...
+FLUSH_INTERVAL = float(os.getenv('MESSAGE_FLUSH_INTERVAL', 0))
+# ...or as soon as this many are waiting. Without a flush interval there is
+# no flush worker, so every message is written as it arrives.
+FLUSH_SIZE = int(os.getenv('MESSAGE_FLUSH_SIZE', 100)) if FLUSH_INTERVAL > 0 else 1
+
+
+class MessageBuffer:
+    """Write-behind buffer for chat messages sent over the socket.
+
+    Messages are acknowledged and broadcast as soon as they are buffered,
+    with a ``client_id`` standing in for the database id. Each flush writes
+    the whole buffer with one executemany INSERT and one transaction, then
+    tells each conversation room the ids the messages were given in a
+    ``messages_saved`` event. A failed flush keeps its messages for the next
+    attempt. The buffer is flushed on SIGTERM and at interpreter exit; a
+    hard crash loses at most the last FLUSH_INTERVAL of messages.
+    """
+
+    def __init__(self, flush_size=FLUSH_SIZE):
+        self.flush_size = flush_size
+        self._lock = threading.Lock()
+        # Serializes flushes so batches are written in the order received
+        self._flush_lock = threading.Lock()
+        self._pending = []
+
+    def add(self, conversation_id, sender_id, content):
+        """Buffer a message and return it.
+
+        Call flush_if_full() once the message has been broadcast, so that
+        ``messages_saved`` never reaches a client before the message does.
+        """
+        message = {
+            'client_id': uuid.uuid4().hex,
+            'conversation_id': conversation_id,
+            'sender_id': sender_id,
+            'content': content,
+            'created_at': datetime.utcnow(),
+        }
+        with self._lock:
+            self._pending.append(message)
+        return message
+
+    def flush_if_full(self):
+        """Flush inline when FLUSH_SIZE messages are waiting."""
+        if self.pending() < self.flush_size:
+            return
+        try:
+            self.flush()
+        except Exception:
+            # The batch is back in the buffer and the next flush retries it,
+            # so the message is still accepted; failing the send would make
+            # the client resend it and store it twice.
+            logger.exception('Message flush failed; %s messages kept', self.pending())
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, blocking=True):
+        """Write every buffered message; returns ``{client_id: message_id}``.
+
+        With ``blocking=False`` nothing is written (and None returned) while
+        another flush is in progress.
+        """
+        if not self._flush_lock.acquire(blocking):
+            return None
+        try:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return {}
+
+            try:
+                ids = self._write(batch)
+            except BaseException:
+                # Also on SystemExit, so a flush cut short by shutdown leaves
+                # its batch for the exit flush
+                db.session.rollback()
+                with self._lock:
+                    self._pending[:0] = batch
+                raise
+        finally:
+            self._flush_lock.release()
+
+        by_conversation = defaultdict(dict)
+        for message in batch:
+            by_conversation[message['conversation_id']][message['client_id']] = ids[message['client_id']]
+        for conversation_id, saved in by_conversation.items():
+            socketio.emit('messages_saved', {
+                'conversation_id': conversation_id,
+                'ids': saved
+            }, room=f'conversation_{conversation_id}')
+        return ids
+
+    @staticmethod
+    def _write(batch):
+        messages = insert_and_fetch(Message, [{
+            'conversation_id': message['conversation_id'],
+            'sender_id': message['sender_id'],
+            'content': message['content'],
+            'created_at': message['created_at'],
+        } for message in batch], key=('conversation_id', 'sender_id', 'created_at'))
+
+        ids = {}
+        latest = {}
+        for message, row in zip(batch, messages):
+            ids[message['client_id']] = row.id
+            latest[message['conversation_id']] = (row.id, message['created_at'])
+
+        # The Core insert bypasses Message's after_insert hook, so keep the
+        # inbox columns current here; never move them backwards.
+        conversations = Conversation.__table__
+        db.session.execute(
+            conversations.update()
+            .where(conversations.c.id == bindparam('conversation'))
+            .where(or_(
+                conversations.c.last_message_id.is_(None),
+                conversations.c.last_message_id < bindparam('last_id')
+            ))
+            .values(last_message_id=bindparam('last_id'), updated_at=bindparam('last_at')),
+            [{'conversation': conversation_id, 'last_id': message_id, 'last_at': created_at}
+             for conversation_id, (message_id, created_at) in latest.items()]
+        )
+        db.session.commit()
+        return ids
+
+    def flush_on_exit(self, app, blocking=True):
+        """Write whatever is still buffered at shutdown."""
+        with app.app_context():
+            try:
+                self.flush(blocking)
+            except Exception:
+                logger.exception('Lost %s buffered messages at shutdown', self.pending())
+
+    def flush_on_shutdown(self, app):
+        """Flush at interpreter exit and on SIGTERM.
+
+        The server stops on SIGTERM without running atexit, so the signal is
+        handled here: the buffer is flushed, then the previous handler runs,
+        or the process exits normally, which runs the atexit flush as well.
+        """
+        atexit.register(self.flush_on_exit, app)
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def on_sigterm(signum, frame):
+            # The signal may interrupt a flush that holds the lock; that batch
+            # goes back to the buffer as the exit unwinds it and atexit
+            # writes it.
+            self.flush_on_exit(app, blocking=False)
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                raise SystemExit(128 + signum)
+
+        try:
+            signal.signal(signal.SIGTERM, on_sigterm)
+        except ValueError:
+            # Only the main thread may set handlers; atexit still applies
+            logger.warning('Buffered messages are not flushed on SIGTERM: '
+                           'app created outside the main thread')
+
+def serialize(message):
+    """The buffered message in Message.to_dict() form, before it has an id."""
+    return {
+        'id': None,
+        'client_id': message['client_id'],
+        'content': message['content'],
+        'sender_id': message['sender_id'],
+        'conversation_id': message['conversation_id'],
+        'created_at': message['created_at'].isoformat(),
+        'read_at': None
+    }
+
+
+message_buffer = MessageBuffer()
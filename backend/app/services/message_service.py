@@ -0,0 +1,157 @@
+from datetime import datetime
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import aliased, selectinload
+from app.models import Conversation, Message, SocketOutbox
+from app.models.message import conversation_participants
+from app.pagination import keyset_filter
+from app import db
+
+
+class MessageService:
+    @staticmethod
+    def is_participant(conversation_id, user_id):
+        """Primary-key lookup on conversation_participants."""
+        return db.session.query(
+            exists().where(and_(
+                conversation_participants.c.conversation_id == conversation_id,
+                conversation_participants.c.user_id == user_id
+            ))
+        ).scalar()
+
+    @staticmethod
+    def get_history(conversation_id, before_id=None, limit=50):
+        """Return up to ``limit`` messages older than ``before_id``, oldest first,
+        and whether there are more before them.
+
+        Walks the (conversation_id, created_at, id) index backwards from the
+        cursor, so the cost depends on the page size, not the history length.
+        """
+        query = Message.query.filter(Message.conversation_id == conversation_id)
+
+        if before_id is not None:
+            cursor = db.session.query(Message.created_at, Message.id).filter(
+                Message.id == before_id,
+                Message.conversation_id == conversation_id
+            ).first()
+            if cursor is None:
+                raise LookupError('Unknown message cursor')
+            query = query.filter(keyset_filter(
+                [Message.created_at, Message.id], cursor, descending=True
+            ))
+
+        messages = query.order_by(
+            Message.created_at.desc(), Message.id.desc()
+        ).limit(limit + 1).all()
+
+        has_more = len(messages) > limit
+        return messages[:limit][::-1], has_more
+
+    @staticmethod
+    def get_inbox(user_id, before=None, limit=20):
+        """The user's conversations, most recently active first, each with its
+        last message and unread count.
+
+        Two queries regardless of history size: one for the conversations
+        joined to their last message and unread count, and one
+        selectin load for the participants of the whole page. ``before`` is
+        the ``(updated_at, id)`` of the last conversation of the previous page.
+        """
+        cp = conversation_participants
+        last_message = aliased(Message)
+        unread = MessageService._unread_counts_query(user_id).subquery()
+
+        query = db.session.query(
+            Conversation,
+            last_message,
+            func.coalesce(unread.c.unread_count, 0)
+        ).join(
+            cp, and_(cp.c.conversation_id == Conversation.id, cp.c.user_id == user_id)
+        ).outerjoin(
+            last_message, last_message.id == Conversation.last_message_id
+        ).outerjoin(
+            unread, unread.c.conversation_id == Conversation.id
+        ).options(selectinload(Conversation.participants))
+
+        if before is not None:
+            query = query.filter(keyset_filter(
+                [Conversation.updated_at, Conversation.id], before, descending=True
+            ))
+
+        rows = query.order_by(
+            Conversation.updated_at.desc(), Conversation.id.desc()
+        ).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        return rows[:limit], has_more
+
+    @staticmethod
+    def mark_read(conversation_id, user_id, message_id):
+        """Mark every message up to ``message_id`` as read for ``user_id``.
+
+        One ranged UPDATE over the (conversation_id, id) index stamps
+        read_at, and the participant's last_read_message_id only ever moves
+        forward. Returns the number of messages newly marked.
+        """
+        in_conversation = db.session.query(Message.id).filter(
+            Message.id == message_id,
+            Message.conversation_id == conversation_id
+        ).first()
+        if in_conversation is None:
+            raise LookupError('Message not found in this conversation')
+
+        messages = Message.__table__
+        cp = conversation_participants
+        marked = db.session.execute(
+            messages.update()
+            .where(messages.c.conversation_id == conversation_id)
+            .where(messages.c.id <= message_id)
+            .where(messages.c.sender_id != user_id)
+            .where(messages.c.read_at.is_(None))
+            .values(read_at=datetime.utcnow())
+        ).rowcount
+
+        db.session.execute(
+            cp.update()
+            .where(cp.c.conversation_id == conversation_id)
+            .where(cp.c.user_id == user_id)
+            .where(or_(
+                cp.c.last_read_message_id.is_(None),
+                cp.c.last_read_message_id < message_id
+            ))
+            .values(last_read_message_id=message_id)
+        )
+
+        SocketOutbox.enqueue([(
+            'messages_read',
+            {'conversation_id': conversation_id, 'user_id': user_id, 'message_id': message_id},
+            f'conversation_{conversation_id}'
+        )])
+        db.session.commit()
+        return marked
+
+    @staticmethod
+    def get_unread_counts(user_id):
+        """Unread message count per conversation, in one indexed query."""
+        return {
+            row.conversation_id: row.unread_count
+            for row in MessageService._unread_counts_query(user_id)
+        }
+
+    @staticmethod
+    def _unread_counts_query(user_id):
+        # Counts messages from others after each of the user's read receipts;
+        # conversations with nothing unread are omitted.
+        cp = conversation_participants
+        return db.session.query(
+            cp.c.conversation_id.label('conversation_id'),
+            func.count(Message.id).label('unread_count')
+        ).join(
+            Message, and_(
+                Message.conversation_id == cp.c.conversation_id,
+                Message.id > func.coalesce(cp.c.last_read_message_id, 0),
+                Message.sender_id != user_id
+            )
+        ).filter(
+            cp.c.user_id == user_id
+        ).group_by(cp.c.conversation_id)
+
@@ -0,0 +1,53 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import literal, select
+from app.models import Notification, NotificationArchive
+from app import db
+
+RETENTION_DAYS = float(os.getenv('NOTIFICATION_RETENTION_DAYS', 30))
+ARCHIVE_ENABLED = os.getenv('NOTIFICATION_ARCHIVE', 'true').lower() in ('1', 'true', 'yes')
+
+# Columns copied to the archive, in matching order
+_COPIED = ('id', 'user_id', 'type', 'content', 'reference_id', 'reference_type',
+           'group_key', 'count', 'read_at', 'delivered_at', 'created_at')
+
+
+class NotificationRetention:
+    @staticmethod
+    def purge(days=RETENTION_DAYS, batch_size=1000, archive=ARCHIVE_ENABLED, now=None):
+        """Remove notifications read more than ``days`` ago.
+
+        Works in chunks of ``batch_size`` rows, each its own short
+        transaction, so a large backlog never holds a long write lock. With
+        ``archive`` the rows are copied to notification_archive first.
+        Unread notifications are never touched. Returns the number of rows
+        removed.
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=days)
+        source = Notification.__table__
+        target = NotificationArchive.__table__
+        total = 0
+
+        while True:
+            ids = [row.id for row in db.session.query(Notification.id).filter(
+                Notification.read_at.isnot(None),
+                Notification.read_at < cutoff
+            ).order_by(Notification.read_at).limit(batch_size)]
+            if not ids:
+                break
+
+            if archive:
+                db.session.execute(target.insert().from_select(
+                    list(_COPIED) + ['archived_at'],
+                    select(*(source.c[name] for name in _COPIED), literal(now))
+                    .where(source.c.id.in_(ids))
+                ))
+            db.session.execute(source.delete().where(source.c.id.in_(ids)))
+            db.session.commit()
+            total += len(ids)
+
+            if len(ids) < batch_size:
+                break
+
+        return total
@@ -1,48 +1,223 @@
-from app.models import Notification, User
-from app import db, socketio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam
+from app.models import Notification, SocketOutbox, User
+from app.models.message import conversation_participants
+from app import db
+from app.bulk import insert_and_fetch
+from app.services.unread_counter import unread_counter
+
+# Unread notifications with the same group key merge within this window
+COALESCE_WINDOW = timedelta(seconds=float(os.getenv('NOTIFICATION_COALESCE_WINDOW', 300)))
+
+# When set, notifications of DIGEST_TYPES are not pushed one by one; a
+# periodic send_digests() pushes each user one summary instead.
+DIGEST_INTERVAL = float(os.getenv('NOTIFICATION_DIGEST_INTERVAL', 0))
+DIGEST_TYPES = {'new_message'}
+
+def _is_digested(type):
+    return DIGEST_INTERVAL > 0 and type in DIGEST_TYPES
 
 class NotificationService:
     @staticmethod
     def create_notification(user_id, type, content, reference_id=None, reference_type=None):
+        digested = _is_digested(type)
         notification = Notification(
             user_id=user_id,
             type=type,
             content=content,
             reference_id=reference_id,
-            reference_type=reference_type
+            reference_type=reference_type,
+            delivered_at=None if digested else datetime.utcnow()
         )
         
         db.session.add(notification)
+        if not digested:
+            # Delivered by the outbox dispatcher once this commits
+            db.session.flush()
+            SocketOutbox.enqueue([
+                ('new_notification', notification.to_dict(), f'user_{user_id}')
+            ])
         db.session.commit()
-        
-        # Emit socket event
-        socketio.emit(
-            'new_notification',
-            notification.to_dict(),
-            room=f'user_{user_id}'
-        )
+        unread_counter.increment([user_id])
         
         return notification
 
     @staticmethod
-    def notify_new_message(conversation, message):
-        for participant in conversation.participants:
-            if participant.id != message.sender_id:
-                sender = User.query.get(message.sender_id)
-                NotificationService.create_notification(
-                    user_id=participant.id,
-                    type='new_message',
-                    content=f'New message from {sender.name}',
-                    reference_id=message.id,
-                    reference_type='message'
+    def create_notifications_bulk(user_ids, type, content, reference_id=None, reference_type=None,
+                                  group_key=None, coalesced_content=None):
+        """Create the same notification for many users at once.
+
+        All rows are written with one executemany INSERT in a single
+        transaction, together with their socket events in the outbox.
+
+        With a ``group_key``, recipients who still have an unread
+        notification of the same type, reference type and group from the
+        last COALESCE_WINDOW get that row updated instead: its count goes up,
+        its content becomes ``coalesced_content(count)`` and it moves back to
+        the top. Coalesced rows are emitted as ``notification_updated``.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return []
+
+        now = datetime.utcnow()
+        digested = _is_digested(type)
+        delivered_at = None if digested else now
+        table = Notification.__table__
+
+        coalesced_ids = []
+        coalesced_users = set()
+        if group_key is not None and COALESCE_WINDOW:
+            open_rows = db.session.query(
+                Notification.id, Notification.user_id, Notification.count
+            ).filter(
+                Notification.user_id.in_(user_ids),
+                Notification.type == type,
+                Notification.reference_type == reference_type,
+                Notification.group_key == group_key,
+                Notification.read_at.is_(None),
+                Notification.created_at >= now - COALESCE_WINDOW
+            ).order_by(Notification.created_at.desc()).all()
+
+            updates = []
+            for row in open_rows:
+                if row.user_id in coalesced_users:
+                    continue
+                coalesced_users.add(row.user_id)
+                count = row.count + 1
+                updates.append({
+                    'target_id': row.id,
+                    'new_count': count,
+                    'new_content': coalesced_content(count) if coalesced_content else content,
+                    'new_reference_id': reference_id,
+                    'new_created_at': now,
+                    'new_delivered_at': delivered_at
+                })
+
+            if updates:
+                db.session.execute(
+                    table.update()
+                    .where(table.c.id == bindparam('target_id'))
+                    .values(
+                        count=bindparam('new_count'),
+                        content=bindparam('new_content'),
+                        reference_id=bindparam('new_reference_id'),
+                        created_at=bindparam('new_created_at'),
+                        delivered_at=bindparam('new_delivered_at')
+                    ),
+                    updates
                 )
+                coalesced_ids = [update['target_id'] for update in updates]
+
+        new_user_ids = [user_id for user_id in user_ids if user_id not in coalesced_users]
+        notifications = insert_and_fetch(Notification, [{
+            'user_id': user_id,
+            'type': type,
+            'content': content,
+            'reference_id': reference_id,
+            'reference_type': reference_type,
+            'group_key': group_key,
+            'count': 1,
+            'delivered_at': delivered_at,
+            'created_at': now
+        } for user_id in new_user_ids], key=('user_id', 'type', 'created_at'))
+        if coalesced_ids:
+            notifications += Notification.query.filter(Notification.id.in_(coalesced_ids)).all()
+
+        if not digested:
+            coalesced = set(coalesced_ids)
+            SocketOutbox.enqueue([(
+                'notification_updated' if notification.id in coalesced else 'new_notification',
+                notification.to_dict(),
+                f'user_{notification.user_id}'
+            ) for notification in notifications])
+
+        db.session.commit()
+        unread_counter.increment(new_user_ids)
+
+        return notifications
+
+    @staticmethod
+    def send_digests(batch_size=1000):
+        """Push each user one summary of their undelivered notifications."""
+        pending = Notification.query.filter(
+            Notification.delivered_at.is_(None),
+            Notification.read_at.is_(None)
+        ).order_by(Notification.created_at.desc()).limit(batch_size).all()
+        if not pending:
+            return 0
+
+        by_user = defaultdict(list)
+        for notification in pending:
+            by_user[notification.user_id].append(notification)
+
+        Notification.query.filter(
+            Notification.id.in_([notification.id for notification in pending])
+        ).update({'delivered_at': datetime.utcnow()}, synchronize_session=False)
+        SocketOutbox.enqueue([(
+            'notification_digest',
+            {
+                'count': sum(notification.count for notification in notifications),
+                'notifications': [notification.to_dict() for notification in notifications]
+            },
+            f'user_{user_id}'
+        ) for user_id, notifications in by_user.items()])
+        db.session.commit()
+
+        return len(by_user)
+
+    @staticmethod
+    def get_unread_count(user_id):
+        return unread_counter.get(user_id)
+
+    @staticmethod
+    def mark_all_read(user_id):
+        since = unread_counter.version(user_id)
+        Notification.query.filter_by(
+            user_id=user_id,
+            read_at=None
+        ).update({
+            'read_at': datetime.utcnow()
+        })
+        
+        db.session.commit()
+        unread_counter.reset(user_id, since)
+
+    @staticmethod
+    def notify_new_message(conversation, message):
+        recipient_ids = [row.user_id for row in db.session.query(
+            conversation_participants.c.user_id
+        ).filter(
+            conversation_participants.c.conversation_id == conversation.id,
+            conversation_participants.c.user_id != message.sender_id
+        )]
+        if not recipient_ids:
+            return []
+
+        sender_name = User.query.get(message.sender_id).display_name
+        return NotificationService.create_notifications_bulk(
+            recipient_ids,
+            type='new_message',
+            content=f'New message from {sender_name}',
+            reference_id=message.id,
+            reference_type='message',
+            # One row per sender, so the count and the name always agree
+            group_key=f'conversation:{conversation.id}:sender:{message.sender_id}',
+            coalesced_content=lambda count: f'{count} new messages from {sender_name}'
+        )
 
     @staticmethod
     def notify_event_invitation(event, invitee_id):
-        NotificationService.create_notification(
-            user_id=invitee_id,
+        return NotificationService.notify_event_invitations(event, [invitee_id])
+
+    @staticmethod
+    def notify_event_invitations(event, invitee_ids):
+        return NotificationService.create_notifications_bulk(
+            invitee_ids,
             type='event_invitation',
             content=f'You have been invited to {event.title}',
             reference_id=event.id,
             reference_type='event'
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from app.models import SocketOutbox
+from app import db
+from app.socket import socketio
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_INTERVAL = float(os.getenv('OUTBOX_DISPATCH_INTERVAL', 0.5))
+BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 200))
+MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 8))
+# How long a claimed batch is reserved before another dispatcher may retry it
+LEASE_SECONDS = float(os.getenv('OUTBOX_LEASE_SECONDS', 30))
+
+
+class OutboxDispatcher:
+    """Drains socket_outbox and performs the emits outside any request.
+
+    Delivery is at least once: an emit that succeeded just before a crash is
+    sent again once its lease runs out. Any number of dispatchers can share
+    a database, since each batch is claimed before it is emitted; order is
+    only kept within a batch.
+    """
+
+    @staticmethod
+    def dispatch_batch(batch_size=BATCH_SIZE):
+        """Emit up to ``batch_size`` due rows; returns how many were sent.
+
+        The rows are claimed first with one guarded UPDATE that pushes their
+        available_at out by LEASE_SECONDS, so a concurrent dispatcher skips
+        them. Failed emits are retried with exponential backoff and dropped
+        (with an error logged) after MAX_ATTEMPTS.
+        """
+        now = datetime.utcnow()
+        due = [row.id for row in db.session.query(SocketOutbox.id).filter(
+            SocketOutbox.available_at <= now
+        ).order_by(SocketOutbox.id).limit(batch_size)]
+        if not due:
+            return 0
+
+        claim = uuid.uuid4().hex
+        outbox = SocketOutbox.__table__
+        db.session.execute(
+            outbox.update()
+            .where(outbox.c.id.in_(due))
+            .where(outbox.c.available_at <= now)
+            .values(claimed_by=claim, available_at=now + timedelta(seconds=LEASE_SECONDS))
+        )
+        db.session.commit()
+
+        rows = SocketOutbox.query.filter_by(claimed_by=claim).order_by(SocketOutbox.id).all()
+        if not rows:
+            return 0
+
+        sent = []
+        for row in rows:
+            try:
+                socketio.emit(row.event, json.loads(row.payload), room=row.room)
+                sent.append(row.id)
+            except Exception as e:
+                row.attempts += 1
+                row.last_error = str(e)
+                if row.attempts >= MAX_ATTEMPTS:
+                    logger.error('Dropping %s emit %s after %s attempts: %s',
+                                 row.event, row.id, row.attempts, e)
+                    sent.append(row.id)
+                else:
+                    row.available_at = now + timedelta(seconds=2 ** row.attempts)
+
+        if sent:
+            SocketOutbox.query.filter(SocketOutbox.id.in_(sent)).delete(synchronize_session=False)
+        db.session.commit()
+        return len(sent)
+
+    @staticmethod
+    def drain(batch_size=BATCH_SIZE):
+        """Dispatch batches until nothing is due; returns the total sent."""
+        total = 0
+        while True:
+            sent = OutboxDispatcher.dispatch_batch(batch_size)
+            total += sent
+            if sent < batch_size:
+                return total
+
+    @staticmethod
+    def depth():
+        """Queue depth: rows waiting, how many are retries, and the oldest age."""
+        pending, retrying, oldest = db.session.query(
+            func.count(SocketOutbox.id),
+            func.count(SocketOutbox.id).filter(SocketOutbox.attempts > 0),
+            func.min(SocketOutbox.created_at)
+        ).one()
+        return {
+            'pending': pending,
+            'retrying': retrying,
+            'oldestAgeSeconds': (datetime.utcnow() - oldest).total_seconds() if oldest else 0
+        }
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+from app.models.message import conversation_participants
+from app import db
+from app.socket import socketio
+
+# A connection that has not sent a heartbeat for this long is considered gone
+HEARTBEAT_TIMEOUT = float(os.getenv('PRESENCE_HEARTBEAT_TIMEOUT', 90))
+# How often expired connections are swept and presence changes broadcast to
+# conversation rooms; unset, presence is only available through lookup()
+BROADCAST_INTERVAL = float(os.getenv('PRESENCE_BROADCAST_INTERVAL', 0))
+
+
+class PresenceRegistry:
+    """Who is online, held in process memory and keyed by user id.
+
+    Each user maps to their open connections (Socket.IO session ids) and the
+    last heartbeat of each, so a user with several tabs stays online until
+    the last one closes or stops sending heartbeats. Connections past the
+    heartbeat timeout are dropped whenever their user is looked up, so
+    presence stays correct without the broadcast worker. When it runs,
+    transitions between online and offline are collected and broadcast in
+    batches by broadcast().
+
+    Only connections to this process are known, and a message queue
+    (SOCKETIO_MESSAGE_QUEUE) shares emits, not this state: run the socket
+    server as a single process, and serve /api/presence from it, for
+    lookups to be complete.
+    """
+
+    def __init__(self, heartbeat_timeout=HEARTBEAT_TIMEOUT,
+                 track_changes=BROADCAST_INTERVAL > 0):
+        self.heartbeat_timeout = heartbeat_timeout
+        # Without a broadcaster nothing drains the changes, so none are kept
+        self.track_changes = track_changes
+        self._lock = threading.Lock()
+        # user_id -> {sid: last heartbeat}
+        self._connections = {}
+        self._last_seen = {}
+        self._changed = set()
+
+    def connect(self, user_id, sid, now=None):
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            sessions = self._connections.setdefault(user_id, {})
+            if not sessions:
+                self._mark_changed(user_id)
+            sessions[sid] = now
+            self._last_seen[user_id] = datetime.utcnow()
+            self._expire_user(user_id, now)
+
+    def heartbeat(self, user_id, sid, now=None):
+        # A heartbeat after expiry brings the connection back
+        self.connect(user_id, sid, now)
+
+    def disconnect(self, user_id, sid):
+        with self._lock:
+            self._drop(user_id, [sid])
+
+    def expire(self, now=None):
+        """Drop connections whose heartbeat is older than the timeout."""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            for user_id in list(self._connections):
+                self._expire_user(user_id, now)
+
+    def _expire_user(self, user_id, now):
+        sessions = self._connections.get(user_id)
+        if sessions:
+            stale = [sid for sid, beat in sessions.items()
+                     if now - beat >= self.heartbeat_timeout]
+            if stale:
+                self._drop(user_id, stale)
+
+    def _drop(self, user_id, sids):
+        sessions = self._connections.get(user_id)
+        if not sessions:
+            return
+        for sid in sids:
+            sessions.pop(sid, None)
+        if not sessions:
+            del self._connections[user_id]
+            self._last_seen[user_id] = datetime.utcnow()
+            self._mark_changed(user_id)
+
+    def _mark_changed(self, user_id):
+        if self.track_changes:
+            self._changed.add(user_id)
+
+    def is_online(self, user_id):
+        return self.lookup([user_id])[user_id][0]
+
+    def connection_count(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            self._expire_user(user_id, now)
+            return len(self._connections.get(user_id, ()))
+
+    def lookup(self, user_ids, now=None):
+        """Presence of each of ``user_ids`` as ``{user_id: (online, last_seen)}``.
+
+        ``last_seen`` is None for users not seen since this process started.
+        """
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            for user_id in user_ids:
+                self._expire_user(user_id, now)
+            return {
+                user_id: (user_id in self._connections, self._last_seen.get(user_id))
+                for user_id in user_ids
+            }
+
+    def take_changes(self):
+        """Return the presence of users who went online or offline since the
+        last call, and forget them.
+        """
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return self.lookup(changed)
+
+    def broadcast(self, now=None):
+        """Expire stale connections and emit changes to conversation rooms.
+
+        One query finds the conversations of every changed user, and each
+        room gets a single ``presence`` event listing its changed members.
+        Returns the number of rooms notified.
+        """
+        self.expire(now)
+        changes = self.take_changes()
+        if not changes:
+            return 0
+
+        cp = conversation_participants
+        rows = db.session.query(cp.c.conversation_id, cp.c.user_id).filter(
+            cp.c.user_id.in_(list(changes))
+        )
+
+        rooms = {}
+        for conversation_id, user_id in rows:
+            online, last_seen = changes[user_id]
+            rooms.setdefault(conversation_id, []).append({
+                'user_id': user_id,
+                'online': online,
+                'last_seen': last_seen.isoformat() if last_seen else None
+            })
+
+        for conversation_id, users in rooms.items():
+            socketio.emit('presence', {
+                'conversation_id': conversation_id,
+                'users': users
+            }, room=f'conversation_{conversation_id}')
+        return len(rooms)
+
+
+presence = PresenceRegistry()
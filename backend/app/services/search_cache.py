@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.services import search_sync
+
+
+class SearchCache:
+    """Bounded LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Entries are dropped wholesale whenever an event, group or user changes
+    (see search_sync), so the TTL only bounds staleness from writes that
+    bypass the ORM.
+    """
+
+    def __init__(self, maxsize=512, ttl=30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query, search_type, limit):
+        return (' '.join(query.casefold().split()), search_type, limit)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Computed outside the lock; concurrent misses on one key may both
+        # query, which is cheaper than serializing every search.
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+
+search_cache = SearchCache(
+    maxsize=int(os.getenv('SEARCH_CACHE_SIZE', 512)),
+    ttl=float(os.getenv('SEARCH_CACHE_TTL', 30))
+)
+
+
+@search_sync.subscribe
+def _invalidate(kind, action, target):
+    search_cache.clear()
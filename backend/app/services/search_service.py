@@ -1,66 +1,118 @@
 from app.models import Event, Group, User
-from sqlalchemy import or_
+from app.services.fulltext import FullTextSearch
+from app.services.trigram_index import trigram_index, DEFAULT_THRESHOLD
+from app import db
+from sqlalchemy import String, cast, literal, null, or_, select, union_all
+
+# Columns matched by the LIKE fallback, mirroring the FTS5 indexes
+LIKE_COLUMNS = {
+    'events': (Event, (Event.title, Event.description, Event.location)),
+    'groups': (Group, (Group.name, Group.description)),
+    'users': (User, (User.username, User.first_name, User.last_name, User.email)),
+}
+
+# Compact projection used by search_all: (label, detail, extra) per kind
+ALL_PROJECTIONS = {
+    'events': (Event.title, Event.location, cast(Event.date, String)),
+    'groups': (Group.name, Group.description, null()),
+    'users': (User.username, User.first_name, User.last_name),
+}
 
 class SearchService:
     @staticmethod
     def search_all(query, limit=10):
-        events = Event.query.filter(
-            or_(
-                Event.title.ilike(f'%{query}%'),
-                Event.description.ilike(f'%{query}%')
-            )
-        ).limit(limit).all()
+        """Search every kind in a single UNION ALL query.
 
-        groups = Group.query.filter(
-            or_(
-                Group.name.ilike(f'%{query}%'),
-                Group.description.ilike(f'%{query}%')
-            )
-        ).limit(limit).all()
+        Returns lightweight projections rather than full to_dict() payloads,
+        so no relationships are loaded per hit.
+        """
+        if FullTextSearch.is_available():
+            rows = FullTextSearch.search_all_rows(query, limit)
+        else:
+            rows = SearchService._search_all_like(query, limit)
+
+        results = {'events': [], 'groups': [], 'users': []}
+        for row in rows:
+            results[row.kind].append(_project(row))
+        return results
 
-        users = User.query.filter(
-            or_(
-                User.name.ilike(f'%{query}%'),
-                User.email.ilike(f'%{query}%')
+    @staticmethod
+    def _search_all_like(query, limit):
+        like = f'%{query}%'
+        branches = []
+        for kind, (label, detail, extra) in ALL_PROJECTIONS.items():
+            model, columns = LIKE_COLUMNS[kind]
+            branch = (
+                select(
+                    literal(kind).label('kind'),
+                    model.id.label('id'),
+                    label.label('label'),
+                    detail.label('detail'),
+                    extra.label('extra')
+                )
+                .where(or_(*(column.ilike(like) for column in columns)))
+                .limit(limit)
+                .subquery()
             )
-        ).limit(limit).all()
+            branches.append(select(branch))
 
-        return {
-            'events': [event.to_dict() for event in events],
-            'groups': [group.to_dict() for group in groups],
-            'users': [user.to_dict() for user in users]
-        }
+        return db.session.execute(union_all(*branches)).fetchall()
 
     @staticmethod
     def search_events(query, limit=20):
-        events = Event.query.filter(
-            or_(
-                Event.title.ilike(f'%{query}%'),
-                Event.description.ilike(f'%{query}%'),
-                Event.location.ilike(f'%{query}%')
-            )
-        ).order_by(Event.start_date.asc()).limit(limit).all()
-        
+        events = SearchService._search('events', query, limit, order_by=Event.date.asc())
         return [event.to_dict() for event in events]
 
     @staticmethod
     def search_groups(query, limit=20):
-        groups = Group.query.filter(
-            or_(
-                Group.name.ilike(f'%{query}%'),
-                Group.description.ilike(f'%{query}%')
-            )
-        ).limit(limit).all()
-        
+        groups = SearchService._search('groups', query, limit)
         return [group.to_dict() for group in groups]
 
     @staticmethod
     def search_users(query, limit=20):
-        users = User.query.filter(
-            or_(
-                User.name.ilike(f'%{query}%'),
-                User.email.ilike(f'%{query}%')
-            )
-        ).limit(limit).all()
-        
-        return [user.to_dict() for user in users]
\ No newline at end of file
+        users = SearchService._search('users', query, limit)
+        return [user.to_dict() for user in users]
+
+    @staticmethod
+    def fuzzy_search(query, search_type='all', limit=10, threshold=DEFAULT_THRESHOLD):
+        """Similarity-ranked matches from the trigram index, for misspellings.
+
+        For ``all`` the index payloads are returned as-is (the same compact
+        projection as search_all); for a single type the hits are loaded and
+        serialized like the exact search, in similarity order.
+        """
+        kinds = list(LIKE_COLUMNS) if search_type == 'all' else [search_type]
+        results = {}
+        for kind in kinds:
+            hits = trigram_index.search(query, threshold, limit, kind)
+            if search_type == 'all':
+                results[kind] = [payload for _, _, _, payload in hits]
+                continue
+
+            model = LIKE_COLUMNS[kind][0]
+            ids = [id_ for _, _, id_, _ in hits]
+            by_id = {obj.id: obj for obj in model.query.filter(model.id.in_(ids))} if ids else {}
+            results[kind] = [by_id[id_].to_dict() for id_ in ids if id_ in by_id]
+        return results
+
+    @staticmethod
+    def _search(kind, query, limit, order_by=None):
+        """Full-text search where FTS5 is available, LIKE scan elsewhere."""
+        model, columns = LIKE_COLUMNS[kind]
+
+        if FullTextSearch.is_available():
+            return FullTextSearch.search(model, kind, query, limit)
+
+        like = f'%{query}%'
+        results = model.query.filter(or_(*(column.ilike(like) for column in columns)))
+        if order_by is not None:
+            results = results.order_by(order_by)
+        return results.limit(limit).all()
+
+
+def _project(row):
+    if row.kind == 'events':
+        return {'id': row.id, 'title': row.label, 'location': row.detail, 'date': row.extra}
+    if row.kind == 'groups':
+        return {'id': row.id, 'name': row.label, 'description': row.detail}
+    return {'id': row.id, 'username': row.label, 'firstName': row.detail, 'lastName': row.extra}
@@ -0,0 +1,31 @@
+from sqlalchemy import event
+from app.models import Event, Group, User
+
+# Callbacks notified as (kind, action, target) whenever a searchable row is
+# inserted, updated or deleted through the ORM. In-process indexes and caches
+# subscribe here instead of each registering their own mapper events.
+_subscribers = []
+
+SEARCHABLE_MODELS = {
+    'events': Event,
+    'groups': Group,
+    'users': User,
+}
+
+
+def subscribe(callback):
+    """Register ``callback(kind, action, target)``; usable as a decorator."""
+    _subscribers.append(callback)
+    return callback
+
+
+def _listener(kind, action):
+    def handler(mapper, connection, target):
+        for callback in _subscribers:
+            callback(kind, action, target)
+    return handler
+
+
+for _kind, _model in SEARCHABLE_MODELS.items():
+    for _action in ('insert', 'update', 'delete'):
+        event.listen(_model, f'after_{_action}', _listener(_kind, _action))
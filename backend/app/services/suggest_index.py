@@ -0,0 +1,142 @@
+import threading
+from bisect import bisect_left, insort
+from itertools import chain
+
+from app.models import Group, User
+from app.services import search_sync
+from app import db
+
+
+class PrefixIndex:
+    """Sorted array of search terms answering prefix queries with bisect.
+
+    Each entry can be reachable through several terms (a user by username,
+    first name, last name and full name). Lookups never touch the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._terms = []    # sorted (term, kind, id)
+        self._entries = {}  # (kind, id) -> (suggestion dict, terms)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, kind, id_, suggestion, terms):
+        """Insert or replace the entry for ``(kind, id_)``."""
+        terms = {_normalize(term) for term in terms if term}
+        with self._lock:
+            self._remove_locked(kind, id_)
+            for term in terms:
+                insort(self._terms, (term, kind, id_))
+            self._entries[(kind, id_)] = (suggestion, terms)
+
+    def load(self, entries):
+        """Replace the whole index with ``entries`` of ``(kind, id_,
+        suggestion, terms)``, sorting the terms once rather than inserting
+        them one at a time.
+        """
+        terms = []
+        loaded = {}
+        for kind, id_, suggestion, entry_terms in entries:
+            entry_terms = {_normalize(term) for term in entry_terms if term}
+            terms.extend((term, kind, id_) for term in entry_terms)
+            loaded[(kind, id_)] = (suggestion, entry_terms)
+        terms.sort()
+        with self._lock:
+            self._terms = terms
+            self._entries = loaded
+
+    def remove(self, kind, id_):
+        with self._lock:
+            self._remove_locked(kind, id_)
+
+    def clear(self):
+        with self._lock:
+            self._terms = []
+            self._entries = {}
+
+    def suggest(self, prefix, limit=10, kind=None):
+        """Return up to ``limit`` suggestions whose terms start with ``prefix``."""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        with self._lock:
+            i = bisect_left(self._terms, (prefix,))
+            while i < len(self._terms) and len(results) < limit:
+                term, entry_kind, id_ = self._terms[i]
+                if not term.startswith(prefix):
+                    break
+                if (kind is None or entry_kind == kind) and (entry_kind, id_) not in seen:
+                    seen.add((entry_kind, id_))
+                    results.append(self._entries[(entry_kind, id_)][0])
+                i += 1
+        return results
+
+    def _remove_locked(self, kind, id_):
+        entry = self._entries.pop((kind, id_), None)
+        if entry is None:
+            return
+        for term in entry[1]:
+            i = bisect_left(self._terms, (term, kind, id_))
+            if i < len(self._terms) and self._terms[i] == (term, kind, id_):
+                del self._terms[i]
+
+
+def _normalize(term):
+    return ' '.join(term.casefold().split())
+
+
+def _user_entry(id_, username, first_name, last_name):
+    full_name = ' '.join(part for part in (first_name, last_name) if part)
+    suggestion = {
+        'type': 'user',
+        'id': id_,
+        'label': full_name or username,
+        'username': username
+    }
+    return suggestion, (username, first_name, last_name, full_name)
+
+
+def _group_entry(id_, name):
+    suggestion = {'type': 'group', 'id': id_, 'label': name}
+    # Every word of the name is a term, so "enth" finds "Tech Enthusiasts"
+    words = name.split()
+    return suggestion, [name] + [' '.join(words[i:]) for i in range(1, len(words))]
+
+
+suggest_index = PrefixIndex()
+
+
+def build_suggest_index():
+    """Load every user and public group into ``suggest_index``."""
+    users = (
+        ('user', row.id) + _user_entry(*row)
+        for row in db.session.query(User.id, User.username, User.first_name, User.last_name)
+    )
+    groups = (
+        ('group', row.id) + _group_entry(*row)
+        for row in db.session.query(Group.id, Group.name).filter(Group.is_private.isnot(True))
+    )
+    suggest_index.load(chain(users, groups))
+
+    return len(suggest_index)
+
+
+@search_sync.subscribe
+def _sync(kind, action, target):
+    if kind == 'users':
+        if action == 'delete':
+            suggest_index.remove('user', target.id)
+        else:
+            suggest_index.add('user', target.id, *_user_entry(
+                target.id, target.username, target.first_name, target.last_name
+            ))
+    elif kind == 'groups':
+        if action == 'delete' or target.is_private:
+            suggest_index.remove('group', target.id)
+        else:
+            suggest_index.add('group', target.id, *_group_entry(target.id, target.name))
@@ -0,0 +1,160 @@
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+
+from app.models import Event, Group, User
+from app.services import search_sync
+from app import db
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+DEFAULT_THRESHOLD = float(os.getenv('SEARCH_FUZZY_THRESHOLD', 0.3))
+
+
+def trigrams(text):
+    """pg_trgm style trigrams: each word padded with two leading blanks and
+    one trailing blank, lowercased."""
+    grams = set()
+    for word in _WORD_RE.findall((text or '').casefold()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Inverted index from trigram to document, for typo-tolerant matching.
+
+    Documents are ``(kind, id, field)`` so an event can match on its title or
+    its location; results are merged per ``(kind, id)`` keeping the best
+    field. Candidates come from the posting lists of the query's trigrams,
+    never from a scan of every document.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = defaultdict(set)  # trigram -> {(kind, id, field)}
+        self._docs = {}                    # (kind, id, field) -> trigrams
+        self._payloads = {}                # (kind, id) -> (payload, fields)
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def add(self, kind, id_, payload, fields):
+        """Insert or replace ``(kind, id_)``; ``fields`` maps field name to text."""
+        with self._lock:
+            self._remove_locked(kind, id_)
+            for field, text in fields.items():
+                grams = trigrams(text)
+                if not grams:
+                    continue
+                doc = (kind, id_, field)
+                self._docs[doc] = grams
+                for gram in grams:
+                    self._postings[gram].add(doc)
+            self._payloads[(kind, id_)] = (payload, tuple(fields))
+
+    def remove(self, kind, id_):
+        with self._lock:
+            self._remove_locked(kind, id_)
+
+    def clear(self):
+        with self._lock:
+            self._postings = defaultdict(set)
+            self._docs = {}
+            self._payloads = {}
+
+    def search(self, query, threshold=DEFAULT_THRESHOLD, limit=20, kind=None):
+        """Return ``(similarity, kind, id, payload)`` tuples, most similar first.
+
+        Similarity is the Jaccard index of the trigram sets, as in pg_trgm.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            shared = Counter()
+            for gram in query_grams:
+                for doc in self._postings.get(gram, ()):
+                    if kind is None or doc[0] == kind:
+                        shared[doc] += 1
+
+            best = {}
+            for doc, count in shared.items():
+                similarity = count / (len(query_grams) + len(self._docs[doc]) - count)
+                key = doc[:2]
+                if similarity >= threshold and similarity > best.get(key, 0):
+                    best[key] = similarity
+
+            ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [
+                (similarity, key[0], key[1], self._payloads[key][0])
+                for key, similarity in ranked
+            ]
+
+    def _remove_locked(self, kind, id_):
+        entry = self._payloads.pop((kind, id_), None)
+        if entry is None:
+            return
+        for field in entry[1]:
+            doc = (kind, id_, field)
+            for gram in self._docs.pop(doc, ()):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(doc)
+                    if not postings:
+                        del self._postings[gram]
+
+
+def _event_entry(id_, title, location, date):
+    payload = {
+        'id': id_,
+        'title': title,
+        'location': location,
+        'date': date.isoformat() if date else None
+    }
+    return payload, {'title': title, 'location': location}
+
+
+def _group_entry(id_, name):
+    return {'id': id_, 'name': name}, {'name': name}
+
+
+def _user_entry(id_, username, first_name, last_name):
+    payload = {'id': id_, 'username': username, 'firstName': first_name, 'lastName': last_name}
+    full_name = ' '.join(part for part in (first_name, last_name) if part)
+    return payload, {'username': username, 'name': full_name}
+
+
+trigram_index = TrigramIndex()
+
+
+def build_trigram_index():
+    """Load event titles/locations, group names and user names."""
+    trigram_index.clear()
+
+    for row in db.session.query(Event.id, Event.title, Event.location, Event.date):
+        trigram_index.add('events', row.id, *_event_entry(*row))
+    for row in db.session.query(Group.id, Group.name):
+        trigram_index.add('groups', row.id, *_group_entry(*row))
+    for row in db.session.query(User.id, User.username, User.first_name, User.last_name):
+        trigram_index.add('users', row.id, *_user_entry(*row))
+
+    return len(trigram_index)
+
+
+@search_sync.subscribe
+def _sync(kind, action, target):
+    if action == 'delete':
+        trigram_index.remove(kind, target.id)
+    elif kind == 'events':
+        trigram_index.add(kind, target.id, *_event_entry(
+            target.id, target.title, target.location, target.date
+        ))
+    elif kind == 'groups':
+        trigram_index.add(kind, target.id, *_group_entry(target.id, target.name))
+    elif kind == 'users':
+        trigram_index.add(kind, target.id, *_user_entry(
+            target.id, target.username, target.first_name, target.last_name
+        ))
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+from app.socket import socketio
+
+# How often pending typing state is broadcast, in seconds. Unset, there is
+# no broadcast worker and each change is broadcast as it happens.
+FLUSH_INTERVAL = float(os.getenv('TYPING_FLUSH_INTERVAL', 0))
+# A typist is re-announced at most this often while they keep typing
+THROTTLE_INTERVAL = float(os.getenv('TYPING_THROTTLE_INTERVAL', 3))
+# A typist with no keystroke for this long is treated as stopped
+STOP_TIMEOUT = float(os.getenv('TYPING_STOP_TIMEOUT', 5))
+
+
+class TypingThrottle:
+    """Coalesces typing keystrokes into one periodic emit per room.
+
+    Keystrokes only update in-memory state keyed by (user_id,
+    conversation_id). A typist is announced when they start or stop typing,
+    and re-announced while they keep typing at most every
+    THROTTLE_INTERVAL, so traffic follows active typists rather than
+    keystrokes. Each room gets a single ``user_typing`` event per broadcast
+    carrying only these changes, as ``typing`` and ``stopped`` lists of
+    user ids; a process only reports the users connected to it, so the
+    events from several processes add up in the client. Typists who go
+    quiet for STOP_TIMEOUT, or disconnect, are dropped without needing an
+    explicit stop.
+    """
+
+    def __init__(self, throttle_interval=THROTTLE_INTERVAL, stop_timeout=STOP_TIMEOUT):
+        self.throttle_interval = throttle_interval
+        self.stop_timeout = stop_timeout
+        self._lock = threading.Lock()
+        # conversation_id -> {user_id: [last keystroke, last announced]}
+        self._typists = {}
+        # conversation_id -> {user_id: typing?} not yet broadcast
+        self._changes = {}
+        self._sweeping = False
+
+    def typing(self, conversation_id, user_id, now=None):
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            room = self._typists.setdefault(conversation_id, {})
+            state = room.get(user_id)
+            if state is None:
+                room[user_id] = [now, now]
+                self._change(conversation_id, user_id, True)
+            else:
+                state[0] = now
+                if now - state[1] >= self.throttle_interval:
+                    state[1] = now
+                    self._change(conversation_id, user_id, True)
+
+    def stopped(self, conversation_id, user_id):
+        with self._lock:
+            self._stop(conversation_id, user_id)
+
+    def disconnected(self, user_id):
+        """Stop ``user_id`` typing in every conversation."""
+        with self._lock:
+            for conversation_id in list(self._typists):
+                self._stop(conversation_id, user_id)
+
+    def _stop(self, conversation_id, user_id):
+        room = self._typists.get(conversation_id)
+        if room and room.pop(user_id, None) is not None:
+            self._change(conversation_id, user_id, False)
+            if not room:
+                del self._typists[conversation_id]
+
+    def _change(self, conversation_id, user_id, typing):
+        self._changes.setdefault(conversation_id, {})[user_id] = typing
+
+    def flush(self, now=None):
+        """Expire quiet typists and return the changes since the last flush
+        as ``{conversation_id: {user_id: typing?}}``.
+        """
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            for conversation_id, room in list(self._typists.items()):
+                expired = [user_id for user_id, (last, _) in room.items()
+                           if now - last >= self.stop_timeout]
+                for user_id in expired:
+                    self._stop(conversation_id, user_id)
+
+            changes, self._changes = self._changes, {}
+        return changes
+
+    def broadcast(self, now=None):
+        """Emit the pending changes of each room; returns the number of rooms."""
+        changes = self.flush(now)
+        for conversation_id, users in changes.items():
+            socketio.emit('user_typing', {
+                'conversation_id': conversation_id,
+                'typing': sorted(user_id for user_id, typing in users.items() if typing),
+                'stopped': sorted(user_id for user_id, typing in users.items() if not typing)
+            }, room=f'conversation_{conversation_id}')
+        return len(changes)
+
+    def sweep_while_typing(self):
+        """Without the broadcast worker, expire quiet typists from a
+        background task that runs only while someone is typing.
+        """
+        with self._lock:
+            if self._sweeping or not self._typists:
+                return
+            self._sweeping = True
+        socketio.start_background_task(self._sweep)
+
+    def _sweep(self):
+        try:
+            while True:
+                socketio.sleep(self.stop_timeout / 2)
+                self.broadcast()
+                with self._lock:
+                    if not self._typists:
+                        return
+        finally:
+            with self._lock:
+                self._sweeping = False
+
+
+typing_throttle = TypingThrottle()
@@ -0,0 +1,108 @@
+import threading
+
+from sqlalchemy import func
+from app.models import Notification
+from app import db
+
+# COUNTs tried before a user whose count keeps changing is cached anyway
+LOAD_ATTEMPTS = 3
+
+
+class UnreadCounter:
+    """Unread notification counts per user, held in process memory.
+
+    A user's count is loaded with one COUNT the first time it is asked for
+    and then kept current by NotificationService. Writes made by other
+    processes are picked up by reconcile(), which is meant to run
+    periodically.
+
+    Every change to a user's count bumps their version. A value read from
+    the database is only stored if the version hasn't moved since the read
+    began (compare-and-set); otherwise an increment may be missing from it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._versions = {}
+
+    def version(self, user_id):
+        """Token to pass to reset() when it follows a database write."""
+        with self._lock:
+            return self._versions.get(int(user_id), 0)
+
+    def get(self, user_id):
+        # JWT identities arrive as strings; notification rows carry ints
+        user_id = int(user_id)
+        for attempt in range(LOAD_ATTEMPTS):
+            with self._lock:
+                count = self._counts.get(user_id)
+                if count is not None:
+                    return count
+                seen = self._versions.get(user_id, 0)
+
+            count = _count_unread([user_id]).get(user_id, 0)
+            with self._lock:
+                if user_id in self._counts:
+                    return self._counts[user_id]
+                # A notification landed while we counted and may not be in
+                # the COUNT, so count again; reconcile() settles a user who
+                # keeps racing.
+                if self._versions.get(user_id, 0) == seen or attempt == LOAD_ATTEMPTS - 1:
+                    self._counts[user_id] = count
+                    return count
+
+    def increment(self, user_ids, by=1):
+        with self._lock:
+            for user_id in map(int, user_ids):
+                self._bump(user_id)
+                if user_id in self._counts:
+                    self._counts[user_id] += by
+                # Anyone else is loaded fresh on their first get()
+
+    def reset(self, user_id, since):
+        """Zero the count after everything up to version ``since`` was read.
+
+        If a notification arrived in the meantime the count is dropped
+        instead, and the next get() loads it.
+        """
+        user_id = int(user_id)
+        with self._lock:
+            self._store(user_id, 0, since)
+
+    def reconcile(self):
+        """Replace every tracked count with the database's, in one query."""
+        with self._lock:
+            versions = {user_id: self._versions.get(user_id, 0) for user_id in self._counts}
+        if not versions:
+            return 0
+
+        counts = _count_unread(list(versions))
+        with self._lock:
+            for user_id, seen in versions.items():
+                self._store(user_id, counts.get(user_id, 0), seen)
+        return len(versions)
+
+    def _bump(self, user_id):
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def _store(self, user_id, count, seen):
+        # Called with the lock held
+        if self._versions.get(user_id, 0) == seen:
+            self._counts[user_id] = count
+        else:
+            self._counts.pop(user_id, None)
+        self._bump(user_id)
+
+
+def _count_unread(user_ids):
+    rows = db.session.query(
+        Notification.user_id, func.count(Notification.id)
+    ).filter(
+        Notification.user_id.in_(user_ids),
+        Notification.read_at.is_(None)
+    ).group_by(Notification.user_id)
+    return dict(rows)
+
+
+unread_counter = UnreadCounter()
@@ -1,19 +1,80 @@
+import os
+
 from flask_socketio import SocketIO, emit, join_room, leave_room
+from flask import request
 from flask_jwt_extended import decode_token
 from app.models import User, Conversation
 
 socketio = SocketIO()
 
+
+def message_queue_options():
+    """Socket.IO options for sharing emits and rooms across processes.
+
+    With SOCKETIO_MESSAGE_QUEUE set, every process publishes its emits to the
+    queue and each Socket.IO worker delivers them to its own clients, so an
+    emit from any worker reaches a client connected to any other. Use a
+    ``redis://`` URL (needs ``redis``) or any Kombu URL (needs ``kombu``),
+    e.g. ``sqla+sqlite:///socketio-queue.db`` for a local stand-in. Unset,
+    rooms live in this process only.
+    """
+    url = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    if not url:
+        return {}
+    return {
+        'message_queue': url,
+        'channel': os.getenv('SOCKETIO_CHANNEL', 'flask-socketio'),
+    }
+
+# Authenticated user of each connected socket, by session id
+_session_users = {}
+
 @socketio.on('connect')
 def handle_connect():
     token = request.args.get('token')
     try:
         decoded = decode_token(token)
-        user_id = decoded['sub']
+        user_id = int(decoded['sub'])
         join_room(f'user_{user_id}')
+        _session_users[request.sid] = user_id
     except:
         return False
 
+    from app.services.presence import presence
+    presence.connect(user_id, request.sid)
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    user_id = _session_users.pop(request.sid, None)
+    if user_id is not None:
+        from app.services.presence import presence
+        from app.services.typing_throttle import typing_throttle
+        presence.disconnect(user_id, request.sid)
+        typing_throttle.disconnected(user_id)
+        _typing_changed()
+
+@socketio.on('heartbeat')
+def handle_heartbeat():
+    user_id = _session_users.get(request.sid)
+    if user_id is not None:
+        from app.services.presence import presence
+        presence.heartbeat(user_id, request.sid)
+
+def _typing_args(data):
+    # The typist is always the socket's authenticated user; the web client
+    # sends camelCase, older clients snake_case
+    data = data if isinstance(data, dict) else {}
+    conversation_id = data.get('conversation_id', data.get('conversationId'))
+    return conversation_id, _session_users.get(request.sid)
+
+def _typing_changed():
+    # Without the broadcast worker, changes go out now and a short-lived
+    # task expires typists who go quiet
+    from app.services.typing_throttle import typing_throttle, FLUSH_INTERVAL
+    if not FLUSH_INTERVAL:
+        typing_throttle.broadcast()
+        typing_throttle.sweep_while_typing()
+
 @socketio.on('join_conversation')
 def handle_join_conversation(data):
     conversation_id = data['conversation_id']
@@ -25,10 +86,47 @@ def handle_leave_conversation(data):
     leave_room(f'conversation_{conversation_id}')
 
 @socketio.on('typing')
-def handle_typing(data):
-    conversation_id = data['conversation_id']
-    user_id = data['user_id']
-    emit('user_typing', {
-        'user_id': user_id,
-        'conversation_id': conversation_id
-    }, room=f'conversation_{conversation_id}') 
\ No newline at end of file
+@socketio.on('typing_start')
+def handle_typing(data=None):
+    from app.services.typing_throttle import typing_throttle
+    conversation_id, user_id = _typing_args(data)
+    if conversation_id is not None and user_id is not None:
+        typing_throttle.typing(conversation_id, user_id)
+        _typing_changed()
+
+@socketio.on('typing_stop')
+def handle_typing_stop(data=None):
+    from app.services.typing_throttle import typing_throttle
+    conversation_id, user_id = _typing_args(data)
+    if conversation_id is not None and user_id is not None:
+        typing_throttle.stopped(conversation_id, user_id)
+        _typing_changed()
+
+@socketio.on('send_message')
+def handle_send_message(data=None):
+    """Buffer a chat message, broadcast it and acknowledge with its client id."""
+    from app.services.message_service import MessageService
+    from app.services.message_buffer import message_buffer, serialize
+
+    user_id = _session_users.get(request.sid)
+    if user_id is None:
+        return {'error': 'Not authenticated'}
+    if not isinstance(data, dict):
+        return {'error': 'Message must be an object'}
+
+    try:
+        conversation_id = int(data.get('conversation_id', data.get('conversationId')))
+    except (TypeError, ValueError):
+        return {'error': 'conversation_id is required'}
+    content = data.get('content')
+    content = content.strip() if isinstance(content, str) else ''
+    if not content:
+        return {'error': 'content is required'}
+    if not MessageService.is_participant(conversation_id, user_id):
+        return {'error': 'Conversation not found'}
+
+    message = message_buffer.add(conversation_id, user_id, content)
+    emit('new_message', serialize(message), room=f'conversation_{conversation_id}')
+    message_buffer.flush_if_full()
+    return {'client_id': message['client_id'], 'created_at': message['created_at'].isoformat()}
+
@@ -0,0 +1,63 @@
+import logging
+import threading
+
+from .extensions import db
+from .socket import socketio
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """Calls ``func`` every ``interval`` seconds on a daemon thread.
+
+    Each run gets its own app context and a fresh session, so workers never
+    share connections with request handlers.
+    """
+
+    def __init__(self, app, interval, func, name=None):
+        self.app = app
+        self.interval = interval
+        self.func = func
+        self.name = name or func.__name__
+        self._stopped = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self.run, name=self.name, daemon=True).start()
+        return self
+
+    def run(self):
+        while not self._wait():
+            self.run_once()
+
+    def _wait(self):
+        """Sleep for one interval; True once the worker has been stopped."""
+        return self._stopped.wait(self.interval)
+
+    def run_once(self):
+        with self.app.app_context():
+            try:
+                self.func()
+            except Exception:
+                logger.exception('Periodic task %s failed', self.name)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def stop(self):
+        self._stopped.set()
+
+
+class SocketIOWorker(PeriodicWorker):
+    """PeriodicWorker run as a Socket.IO background task.
+
+    That is a greenlet under eventlet and a thread otherwise, so tasks that
+    emit, or run at sub-second intervals, never block the request workers.
+    """
+
+    def start(self):
+        socketio.start_background_task(self.run)
+        return self
+
+    def _wait(self):
+        socketio.sleep(self.interval)
+        return self._stopped.is_set()
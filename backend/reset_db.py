@@ -1,5 +1,6 @@
 from app import create_app
 from app.extensions import db
+from app.services.fulltext import FullTextSearch
 
 def reset_database():
     app = create_app()
@@ -8,6 +9,8 @@ def reset_database():
         db.drop_all()
         print("Creating all tables...")
         db.create_all()
+        # The FTS indexes survive drop_all; re-sync them with the new tables
+        FullTextSearch.install()
         print("Database reset complete!")
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 import React, { useEffect, useRef, useState } from 'react';
 import { useAppDispatch, useAppSelector } from '../../../store/hooks';
-import { fetchNotifications, markAsRead } from '../../../store/slices/notificationSlice';
+import { fetchNotifications, markAsRead, pollNotifications } from '../../../store/slices/notificationSlice';
 import { formatTimeAgo } from '../../../utils/dateUtils';
 import { Notification } from '../../../types';
 
+const POLL_INTERVAL_MS = 30000;
+
 const NotificationsDropdown: React.FC = () => {
   const [isOpen, setIsOpen] = useState(false);
   const dropdownRef = useRef<HTMLDivElement>(null);
@@ -12,6 +14,9 @@ const NotificationsDropdown: React.FC = () => {
 
   useEffect(() => {
     dispatch(fetchNotifications());
+    // Idle polls are cheap: `since` returns only what is new
+    const poll = setInterval(() => dispatch(pollNotifications()), POLL_INTERVAL_MS);
+    return () => clearInterval(poll);
   }, [dispatch]);
 
   useEffect(() => {
@@ -7,7 +7,28 @@ import { getUserFullName } from '../../../types';
 const SearchBar: React.FC = () => {
   const navigate = useNavigate();
   const { query, setQuery, searchType, setSearchType, isSearching } = useSearch();
-  const { results } = useAppSelector((state) => state.search);
+  const { results, hits } = useAppSelector((state) => state.search);
+
+  // 'all' searches return compact hits; single-type searches full records
+  const events = searchType === 'all'
+    ? hits.events.map(event => ({ id: event.id, title: event.title, detail: event.location }))
+    : results.events.map(event => ({ id: event.id, title: event.title, detail: event.location }));
+  const groups = searchType === 'all'
+    ? hits.groups.map(group => ({ id: group.id, title: group.name, detail: group.description || '' }))
+    : results.groups.map(group => ({ id: group.id, title: group.name, detail: `${group.memberCount} members` }));
+  const users = searchType === 'all'
+    ? hits.users.map(user => ({
+        id: user.id,
+        title: [user.firstName, user.lastName].filter(Boolean).join(' ') || user.username,
+        detail: `@${user.username}`,
+        avatar: undefined as string | undefined,
+      }))
+    : results.users.map(user => ({
+        id: user.id,
+        title: getUserFullName(user),
+        detail: user.email,
+        avatar: user.avatar,
+      }));
 
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
@@ -54,42 +75,42 @@ const SearchBar: React.FC = () => {
             </div>
           ) : (
             <div className="divide-y divide-gray-200">
-              {results.events.length > 0 && (
+              {events.length > 0 && (
                 <div className="p-4">
                   <h3 className="text-sm font-medium text-gray-900 mb-2">Events</h3>
-                  {results.events.slice(0, 3).map((event) => (
+                  {events.slice(0, 3).map((event) => (
                     <div
                       key={event.id}
                       onClick={() => navigate(`/events/${event.id}`)}
                       className="py-2 cursor-pointer hover:bg-gray-50"
                     >
                       <p className="text-sm font-medium text-gray-900">{event.title}</p>
-                      <p className="text-sm text-gray-500">{event.location}</p>
+                      <p className="text-sm text-gray-500">{event.detail}</p>
                     </div>
                   ))}
                 </div>
               )}
 
-              {results.groups.length > 0 && (
+              {groups.length > 0 && (
                 <div className="p-4">
                   <h3 className="text-sm font-medium text-gray-900 mb-2">Groups</h3>
-                  {results.groups.slice(0, 3).map((group) => (
+                  {groups.slice(0, 3).map((group) => (
                     <div
                       key={group.id}
                       onClick={() => navigate(`/groups/${group.id}`)}
                       className="py-2 cursor-pointer hover:bg-gray-50"
                     >
-                      <p className="text-sm font-medium text-gray-900">{group.name}</p>
-                      <p className="text-sm text-gray-500">{group.memberCount} members</p>
+                      <p className="text-sm font-medium text-gray-900">{group.title}</p>
+                      <p className="text-sm text-gray-500">{group.detail}</p>
                     </div>
                   ))}
                 </div>
               )}
 
-              {results.users.length > 0 && (
+              {users.length > 0 && (
                 <div className="p-4">
                   <h3 className="text-sm font-medium text-gray-900 mb-2">Users</h3>
-                  {results.users.slice(0, 3).map((user) => (
+                  {users.slice(0, 3).map((user) => (
                     <div
                       key={user.id}
                       onClick={() => navigate(`/profile/${user.id}`)}
@@ -98,12 +119,12 @@ const SearchBar: React.FC = () => {
                       <div className="flex items-center">
                         <img
                           src={user.avatar || 'https://via.placeholder.com/40'}
-                          alt={getUserFullName(user)}
+                          alt={user.title}
                           className="w-8 h-8 rounded-full mr-2"
                         />
                         <div>
-                          <p className="text-sm font-medium text-gray-900">{getUserFullName(user)}</p>
-                          <p className="text-sm text-gray-500">{user.email}</p>
+                          <p className="text-sm font-medium text-gray-900">{user.title}</p>
+                          <p className="text-sm text-gray-500">{user.detail}</p>
                         </div>
                       </div>
                     </div>
@@ -111,7 +132,7 @@ const SearchBar: React.FC = () => {
                 </div>
               )}
 
-              {!results.events.length && !results.groups.length && !results.users.length && (
+              {!events.length && !groups.length && !users.length && (
                 <div className="p-4 text-center text-gray-500">
                   No results found
                 </div>
@@ -1,4 +1,5 @@
 import React from 'react';
+import { Link } from 'react-router-dom';
 import { useAppSelector } from '../../../store/hooks';
 import EventCard from '../events/EventCard';
 import GroupCard from '../groups/GroupCard';
@@ -10,8 +11,22 @@ interface SearchResultsProps {
   type: SearchType;
 }
 
+interface HitRowProps {
+  to: string;
+  title: string;
+  detail: string;
+}
+
+// One compact 'all' search result; full cards need fields it doesn't carry
+const HitRow: React.FC<HitRowProps> = ({ to, title, detail }) => (
+  <Link to={to} className="block px-4 py-3 hover:bg-gray-50">
+    <div className="font-medium text-gray-900">{title}</div>
+    {detail && <div className="text-sm text-gray-500 truncate">{detail}</div>}
+  </Link>
+);
+
 const SearchResults: React.FC<SearchResultsProps> = ({ query, type }) => {
-  const { results, loading } = useAppSelector((state) => state.search);
+  const { results, hits, loading } = useAppSelector((state) => state.search);
 
   if (loading) {
     return (
@@ -58,32 +73,47 @@ const SearchResults: React.FC<SearchResultsProps> = ({ query, type }) => {
       case 'all':
         return (
           <div className="space-y-8">
-            {results.users.length > 0 && (
+            {hits.users.length > 0 && (
               <section>
                 <h3 className="text-lg font-semibold mb-4">People</h3>
-                <div className="grid gap-4">
-                  {results.users.slice(0, 3).map(user => (
-                    <UserCard key={user.id} user={user} />
+                <div className="divide-y divide-gray-100 bg-white rounded-lg shadow">
+                  {hits.users.slice(0, 3).map(user => (
+                    <HitRow
+                      key={user.id}
+                      to={`/profile/${user.id}`}
+                      title={[user.firstName, user.lastName].filter(Boolean).join(' ') || user.username}
+                      detail={`@${user.username}`}
+                    />
                   ))}
                 </div>
               </section>
             )}
-            {results.events.length > 0 && (
+            {hits.events.length > 0 && (
               <section>
                 <h3 className="text-lg font-semibold mb-4">Events</h3>
-                <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
-                  {results.events.slice(0, 3).map(event => (
-                    <EventCard key={event.id} event={event} />
+                <div className="divide-y divide-gray-100 bg-white rounded-lg shadow">
+                  {hits.events.slice(0, 3).map(event => (
+                    <HitRow
+                      key={event.id}
+                      to={`/events/${event.id}`}
+                      title={event.title}
+                      detail={`${new Date(event.date).toLocaleDateString()} · ${event.location}`}
+                    />
                   ))}
                 </div>
               </section>
             )}
-            {results.groups.length > 0 && (
+            {hits.groups.length > 0 && (
               <section>
                 <h3 className="text-lg font-semibold mb-4">Groups</h3>
-                <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
-                  {results.groups.slice(0, 3).map(group => (
-                    <GroupCard key={group.id} group={group} />
+                <div className="divide-y divide-gray-100 bg-white rounded-lg shadow">
+                  {hits.groups.slice(0, 3).map(group => (
+                    <HitRow
+                      key={group.id}
+                      to={`/groups/${group.id}`}
+                      title={group.name}
+                      detail={group.description || ''}
+                    />
                   ))}
                 </div>
               </section>
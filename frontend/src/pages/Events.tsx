@@ -29,6 +29,7 @@ interface Event {
     id: string;
     name: string;
   }> | number;
+  attendeeCount: number;
   capacity: number;
   organizer: {
     name: string;
@@ -44,6 +45,8 @@ const Events: React.FC = () => {
   const [searchQuery, setSearchQuery] = useState("");
   const [events, setEvents] = useState<Event[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   const mapContainerStyle = {
@@ -60,31 +63,35 @@ const Events: React.FC = () => {
     loadEvents();
   }, []);
 
-  const loadEvents = async () => {
+  const loadEvents = async (cursor?: string) => {
     try {
-      setLoading(true);
-      const data = await fetchEvents();
-      setEvents(data);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
+      const { events: page, nextCursor: next } = await fetchEvents(cursor);
+      setEvents(prev => (cursor ? [...prev, ...page] : page));
+      setNextCursor(next);
       
       // Initialize event states with proper typing and validation
-      const initialStates = data.reduce((acc: { [key: string]: EventState }, event: Event) => {
+      const pageStates = page.reduce((acc: { [key: string]: EventState }, event: Event) => {
         acc[event.id] = {
           id: event.id,
           isJoined: Array.isArray(event.attendees) ? 
             event.attendees.some(attendee => attendee.id === 'current-user-id') : 
             false,
-          attendees: Array.isArray(event.attendees) ? 
-            event.attendees.length : 
-            0
+          attendees: event.attendeeCount
         };
         return acc;
       }, {});
-      setEventStates(initialStates);
+      setEventStates(prev => (cursor ? { ...prev, ...pageStates } : pageStates));
     } catch (err) {
       setError('Failed to load events');
       console.error(err);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -240,8 +247,7 @@ const Events: React.FC = () => {
                 <div className="px-6 pb-6">
                   <div className="flex justify-between items-center">
                     <span className="text-sm text-gray-500">
-                      {eventStates[event.id]?.attendees || 
-                       (Array.isArray(event.attendees) ? event.attendees.length : 0)} attending
+                      {eventStates[event.id]?.attendees ?? event.attendeeCount} attending
                     </span>
                     <button 
                       onClick={() => handleJoinEvent(event.id)}
@@ -259,6 +265,18 @@ const Events: React.FC = () => {
             ))}
           </motion.div>
         )}
+
+        {!loading && !error && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={() => loadEvents(nextCursor)}
+              disabled={loadingMore}
+              className="px-6 py-2 bg-white border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50 transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more events'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
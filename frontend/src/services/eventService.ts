@@ -1,14 +1,14 @@
 import api from '../utils/axios';
 import { EventFormData } from '../types/event';
 
-export const fetchEvents = async () => {
+export const fetchEvents = async (cursor?: string) => {
     try {
-        const response = await api.get('/api/events');
-        const events = response.data.map((event: any) => ({
-            ...event,
-            attendees: Array.isArray(event.attendees) ? event.attendees : [],
-        }));
-        return events;
+        const response = await api.get('/api/events', { params: { cursor } });
+        // nextCursor is null on the last page
+        return {
+            events: response.data.events,
+            nextCursor: response.data.nextCursor as string | null,
+        };
     } catch (error) {
         console.error('Error fetching events:', error);
         throw error;
@@ -1,12 +1,28 @@
 import axios from 'axios';
 import { API_URL } from '../config';
+import { Notification } from '../types';
+
+export interface NotificationPage {
+  notifications: Notification[];
+  nextCursor: string | null;
+  sinceCursor: string | null;
+  hasMore: boolean;
+}
 
 export const NotificationService = {
-  async getNotifications() {
-    const response = await axios.get(`${API_URL}/notifications`);
+  // Newest first. Pass sinceCursor back as `since` to fetch only what is new,
+  // or nextCursor as `before` to page back through older notifications.
+  async getNotifications(params?: { before?: string; since?: string }): Promise<NotificationPage> {
+    const response = await axios.get(`${API_URL}/notifications`, { params });
     return response.data;
   },
 
+  // Total unread, not just those on the first page
+  async getUnreadCount(): Promise<number> {
+    const response = await axios.get(`${API_URL}/notifications/unread/count`);
+    return response.data.count;
+  },
+
   async markAsRead(notificationId: string) {
     const response = await axios.patch(`${API_URL}/notifications/${notificationId}/read`);
     return response.data;
@@ -1,19 +1,37 @@
 import { Socket as ClientSocket, connect } from 'socket.io-client';
 import { store } from '../store/store';
-import { addMessage } from '../store/slices/messageSlice';
-import { addNotification } from '../store/slices/notificationSlice';
+import { addMessage, messagesSaved } from '../store/slices/messageSlice';
+import { addNotification, updateNotification, receiveDigest } from '../store/slices/notificationSlice';
 import { API_URL } from '../config';
 import { Message, Notification } from '../types';
 
+// The server marks a connection offline after 90s without a heartbeat
+const HEARTBEAT_INTERVAL_MS = 30000;
+
+// Users who started (or are still) typing in a conversation, and users who
+// stopped; anyone not listed is unchanged
 interface TypingData {
-  conversationId: string;
-  userId: string;
-  isTyping: boolean;
+  conversation_id: number;
+  typing: number[];
+  stopped: number[];
+}
+
+// Database ids of buffered messages, by the client_id they were sent with
+interface SavedMessages {
+  conversation_id: number;
+  ids: Record<string, number>;
+}
+
+// Notifications held back in digest mode, pushed together
+interface NotificationDigest {
+  count: number;
+  notifications: Notification[];
 }
 
 class WebSocketService {
   private socket: ReturnType<typeof connect> | null = null;
   private token: string | null = null;
+  private heartbeat: ReturnType<typeof setInterval> | null = null;
 
   constructor() {
     this.socket = null;
@@ -29,9 +47,17 @@ class WebSocketService {
     });
 
     this.setupEventListeners();
+
+    this.heartbeat = setInterval(() => {
+      this.socket?.emit('heartbeat');
+    }, HEARTBEAT_INTERVAL_MS);
   }
 
   disconnect() {
+    if (this.heartbeat) {
+      clearInterval(this.heartbeat);
+      this.heartbeat = null;
+    }
     if (this.socket) {
       this.socket.disconnect();
       this.socket = null;
@@ -51,13 +77,25 @@ class WebSocketService {
     });
 
     this.socket.on('new_message', (message: Message) => {
-      store.dispatch(addMessage(message));
+      store.dispatch(addMessage({ conversationId: message.conversation_id, message }));
+    });
+
+    this.socket.on('messages_saved', (saved: SavedMessages) => {
+      store.dispatch(messagesSaved(saved));
     });
 
     this.socket.on('new_notification', (notification: Notification) => {
       store.dispatch(addNotification(notification));
     });
 
+    this.socket.on('notification_updated', (notification: Notification) => {
+      store.dispatch(updateNotification(notification));
+    });
+
+    this.socket.on('notification_digest', (digest: NotificationDigest) => {
+      store.dispatch(receiveDigest(digest));
+    });
+
     this.socket.on('user_typing', (data: TypingData) => {
       // Handle typing indicator
       console.log('User typing:', data);
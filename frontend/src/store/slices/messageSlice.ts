@@ -1,4 +1,4 @@
-import { createSlice, createAsyncThunk } from '@reduxjs/toolkit';
+import { createSlice, createAsyncThunk, PayloadAction } from '@reduxjs/toolkit';
 import { MessageService } from '../../services/messageService';
 
 interface MessageState {
@@ -53,6 +53,27 @@ const messageSlice = createSlice({
         state.selectedConversation.messages.push(message);
       }
     },
+    // Messages sent over the socket arrive with id null and a client_id;
+    // the server reports their ids once they are written
+    messagesSaved: (
+      state,
+      action: PayloadAction<{ conversation_id: number; ids: Record<string, number> }>
+    ) => {
+      const { conversation_id, ids } = action.payload;
+      const conversations = [
+        state.conversations.find(c => String(c.id) === String(conversation_id)),
+        state.selectedConversation,
+      ];
+      conversations.forEach(conversation => {
+        if (conversation && String(conversation.id) === String(conversation_id)) {
+          conversation.messages.forEach((message: any) => {
+            if (message.id == null && message.client_id in ids) {
+              message.id = ids[message.client_id];
+            }
+          });
+        }
+      });
+    },
   },
   extraReducers: (builder) => {
     builder
@@ -85,5 +106,5 @@ const messageSlice = createSlice({
   },
 });
 
-export const { selectConversation, addMessage } = messageSlice.actions;
+export const { selectConversation, addMessage, messagesSaved } = messageSlice.actions;
 export default messageSlice.reducer; 
\ No newline at end of file
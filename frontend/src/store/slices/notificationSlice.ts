@@ -1,10 +1,12 @@
-import { createSlice, createAsyncThunk } from '@reduxjs/toolkit';
+import { createSlice, createAsyncThunk, PayloadAction } from '@reduxjs/toolkit';
 import { NotificationService } from '../../services/notificationService';
 import { Notification } from '../../types';
 
 interface NotificationState {
   notifications: Notification[];
   unreadCount: number;
+  // High-water mark for incremental polls
+  sinceCursor: string | null;
   loading: boolean;
   error: string | null;
 }
@@ -12,6 +14,7 @@ interface NotificationState {
 const initialState: NotificationState = {
   notifications: [],
   unreadCount: 0,
+  sinceCursor: null,
   loading: false,
   error: null,
 };
@@ -23,11 +26,22 @@ export const fetchNotifications = createAsyncThunk(
   }
 );
 
+// Fetches only notifications newer than the last fetch or poll, including
+// coalesced ones that were bumped; falls back to a full fetch before the first.
+export const pollNotifications = createAsyncThunk(
+  'notifications/pollNotifications',
+  async (_, { getState }) => {
+    const { notifications } = getState() as { notifications: NotificationState };
+    return await NotificationService.getNotifications(
+      notifications.sinceCursor ? { since: notifications.sinceCursor } : undefined
+    );
+  }
+);
+
 export const fetchUnreadCount = createAsyncThunk(
   'notifications/fetchUnreadCount',
   async () => {
-    const notifications = await NotificationService.getNotifications();
-    return notifications.filter((notification: Notification) => !notification.read).length;
+    return await NotificationService.getUnreadCount();
   }
 );
 
@@ -45,6 +59,18 @@ export const markAllAsRead = createAsyncThunk(
   }
 );
 
+// Puts incoming notifications on top, replacing any copies already listed
+// (coalesced rows come back with the same id), and counts the newly unread.
+const mergeNotifications = (state: NotificationState, incoming: Notification[]) => {
+  const ids = new Set(incoming.map(n => n.id));
+  const knownUnread = new Set(state.notifications.filter(n => !n.read).map(n => n.id));
+  state.unreadCount += incoming.filter(n => !n.read && !knownUnread.has(n.id)).length;
+  state.notifications = [
+    ...incoming,
+    ...state.notifications.filter(n => !ids.has(n.id)),
+  ];
+};
+
 const notificationSlice = createSlice({
   name: 'notifications',
   initialState,
@@ -53,6 +79,14 @@ const notificationSlice = createSlice({
       state.notifications.unshift(action.payload);
       state.unreadCount += 1;
     },
+    // A coalesced notification whose count and content changed
+    updateNotification: (state, action: PayloadAction<Notification>) => {
+      mergeNotifications(state, [action.payload]);
+    },
+    // One summary of notifications held back in digest mode
+    receiveDigest: (state, action: PayloadAction<{ count: number; notifications: Notification[] }>) => {
+      mergeNotifications(state, action.payload.notifications);
+    },
   },
   extraReducers: (builder) => {
     builder
@@ -62,7 +96,12 @@ const notificationSlice = createSlice({
       })
       .addCase(fetchNotifications.fulfilled, (state, action) => {
         state.loading = false;
-        state.notifications = action.payload;
+        state.notifications = action.payload.notifications;
+        state.sinceCursor = action.payload.sinceCursor;
+      })
+      .addCase(pollNotifications.fulfilled, (state, action) => {
+        mergeNotifications(state, action.payload.notifications);
+        state.sinceCursor = action.payload.sinceCursor;
       })
       .addCase(fetchNotifications.rejected, (state, action) => {
         state.loading = false;
@@ -85,5 +124,5 @@ const notificationSlice = createSlice({
   },
 });
 
-export const { addNotification } = notificationSlice.actions;
+export const { addNotification, updateNotification, receiveDigest } = notificationSlice.actions;
 export default notificationSlice.reducer; 
\ No newline at end of file
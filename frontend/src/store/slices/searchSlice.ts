@@ -10,6 +10,11 @@ const initialState: SearchState = {
     events: [],
     groups: [],
   },
+  hits: {
+    users: [],
+    events: [],
+    groups: [],
+  },
   loading: false,
   error: null,
 };
@@ -35,6 +40,7 @@ const searchSlice = createSlice({
     },
     clearResults: (state) => {
       state.results = initialState.results;
+      state.hits = initialState.hits;
       state.query = '';
     },
   },
@@ -46,7 +52,12 @@ const searchSlice = createSlice({
       })
       .addCase(search.fulfilled, (state, action) => {
         state.loading = false;
-        state.results = action.payload;
+        const { type } = action.meta.arg;
+        if (!type || type === 'all') {
+          state.hits = { users: [], events: [], groups: [], ...action.payload };
+        } else {
+          state.results = { ...initialState.results, ...action.payload };
+        }
       })
       .addCase(search.rejected, (state, action) => {
         state.loading = false;
@@ -2,14 +2,42 @@ import { User, Event, Group } from './index';
 
 export type SearchType = 'events' | 'groups' | 'users' | 'all';
 
+// Compact rows returned by an 'all' search, which skips full serialization
+export interface UserHit {
+  id: string;
+  username: string;
+  firstName: string | null;
+  lastName: string | null;
+}
+
+export interface EventHit {
+  id: string;
+  title: string;
+  location: string;
+  date: string;
+}
+
+export interface GroupHit {
+  id: string;
+  name: string;
+  description: string | null;
+}
+
 export interface SearchState {
   type: SearchType;
   query: string;
+  // Full records from a search of one type
   results: {
     users: User[];
     events: Event[];
     groups: Group[];
   };
+  // Compact rows from an 'all' search
+  hits: {
+    users: UserHit[];
+    events: EventHit[];
+    groups: GroupHit[];
+  };
   loading: boolean;
   error: string | null;
 } 
\ No newline at end of file